@@ -13,7 +13,7 @@ Description:
   This script generates a statistical report of the project's test results
   by counting the number of passed and failed tests within the specified folder.
 
-  Failures: fail-*.json
+  Failures: fail-*.json and timeout-*.json
   Passing: pass-*.json
 
 EOF
@@ -32,7 +32,7 @@ if [ ! -d "$TEST_RESULTS_FOLDER" ]; then
 fi
 
 # This script is used to show the statistical report of the project.
-FAILURE_COUNT=$(find "$TEST_RESULTS_FOLDER" -type f -name "fail-*.json" | wc -l)
+FAILURE_COUNT=$(find "$TEST_RESULTS_FOLDER" -type f \( -name "fail-*.json" -o -name "timeout-*.json" \) | wc -l)
 PASS_COUNT=$(find "$TEST_RESULTS_FOLDER" -type f -name "pass-*.json" | wc -l)
 TOTAL_COUNT=$((FAILURE_COUNT + PASS_COUNT))
 
@@ -54,4 +54,7 @@ PYTHONPATH=src uv run python -m cat_ai.reporter \
   "$TOTAL_COUNT" \
   >> "$GITHUB_STEP_SUMMARY"
 
+find "$TEST_RESULTS_FOLDER" -type f -name "validation_summary*.md" -exec cat {} + \
+  >> "$GITHUB_STEP_SUMMARY"
+
 echo ::notice title=Statistical Outcome::Successes: $PASS_COUNT, Failures: $FAILURE_COUNT from total: $TOTAL_COUNT, sample size: $CAT_AI_SAMPLE_SIZE
@@ -0,0 +1,51 @@
+"""
+Compare the scalar statistical analysis loop with the batch analysis.
+
+Usage: PYTHONPATH=src python benchmarks/analysis_batch.py [max_sample_size]
+"""
+
+import sys
+import time
+from typing import Callable
+
+from cat_ai.statistical_analysis import (
+    analyse_measure_from_test_sample,
+    analyse_measures_from_test_samples,
+    analysis_columns,
+    np,
+)
+
+
+def seconds(function: Callable[[], object], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    max_sample_size = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    pairs = [(f, n) for n in range(1, max_sample_size + 1) for f in range(n + 1)]
+    measures = [f for f, _ in pairs]
+    sample_sizes = [n for _, n in pairs]
+    print(f"{len(pairs)} (failures, samples) pairs")
+
+    scalar = seconds(lambda: [analyse_measure_from_test_sample(f, n) for f, n in pairs])
+    cases = {
+        "columns, pure Python": lambda: analysis_columns(measures, sample_sizes, use_numpy=False),
+        "analyses, pure Python": lambda: analyse_measures_from_test_samples(
+            measures, sample_sizes, use_numpy=False
+        ),
+    }
+    if np is not None:
+        cases["columns, NumPy"] = lambda: analysis_columns(measures, sample_sizes, use_numpy=True)
+        cases["analyses, NumPy"] = lambda: analyse_measures_from_test_samples(
+            measures, sample_sizes, use_numpy=True
+        )
+
+    print(f"{'scalar loop':>24} {scalar * 1000:9.1f} ms")
+    for name, case in cases.items():
+        elapsed = seconds(case)
+        print(f"{name:>24} {elapsed * 1000:9.1f} ms {scalar / elapsed:7.1f}x")
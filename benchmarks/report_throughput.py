@@ -0,0 +1,54 @@
+"""
+Measure Reporter.report() throughput for small and large responses.
+
+Usage: PYTHONPATH=src python benchmarks/report_throughput.py [runs] [--no-orjson]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from cat_ai import sinks
+from cat_ai.reporter import Reporter
+
+SMALL_RESPONSE = '{"developer": "Sam", "reason": "knows Python"}'
+LARGE_RESPONSE = "".join(
+    f'{{"developer": "Developer {i}", "reason": "{"knows Python and TypeScript " * 8}"}}'
+    for i in range(200)
+)
+VALIDATIONS = {
+    "correct_developer_suggested": True,
+    "no_developer_name_is_hallucinated": True,
+    "valid_json_returned": True,
+}
+
+
+def reports_per_second(response: str, runs: int, compact: bool, echo: bool) -> float:
+    with tempfile.TemporaryDirectory() as output_dir:
+        with open(os.path.join(output_dir, "stdout.log"), "w") as echo_stream:
+            file_sink = sinks.FileSink(output_dir, compact=compact)
+            echo_sinks = [sinks.StdoutSink(echo_stream, compact=compact)] if echo else []
+            reporter = Reporter("benchmark", output_dir, sinks=[file_sink, *echo_sinks])
+
+            start = time.perf_counter()
+            for run_number in range(runs):
+                reporter.for_run(run_number).report(response, VALIDATIONS)
+            reporter.close()
+            return runs / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    runs = int(args[0]) if args else 2000
+    if "--no-orjson" in sys.argv:
+        sinks.use_fast_encoder(False)
+    print(f"{runs} reports per case, compact encoder: {sinks.compact_encoder()}")
+    print(f"{'response':>10} {'echo':>5} {'pretty/s':>10} {'compact/s':>10} {'speedup':>8}")
+    for name, response in (("small", SMALL_RESPONSE), ("large", LARGE_RESPONSE)):
+        for echo in (False, True):
+            pretty = reports_per_second(response, runs, compact=False, echo=echo)
+            compact = reports_per_second(response, runs, compact=True, echo=echo)
+            print(
+                f"{name:>10} {echo!s:>5} {pretty:>10.0f} {compact:>10.0f} {compact / pretty:>7.2f}x"
+            )
@@ -1,6 +1,6 @@
 import json
 
-from helpers import load_json_fixture
+from helpers import has_expected_success_rate, load_json_fixture
 from openai import OpenAI
 from settings import ROOT_DIR
 
@@ -20,17 +20,6 @@ def get_developer_names_from_response(response) -> set[str]:
     return {developer["name"] for developer in response["developers"]}
 
 
-def has_expected_success_rate(results: list[bool], expected_success_rate: float) -> bool:
-    if not results:
-        return True
-
-    failure_count = sum(not result for result in results)
-    total_count = len(results)
-    failure_rate = float(failure_count) / float(total_count)
-    print(1.0 - failure_rate)
-    return expected_success_rate <= (1.0 - failure_rate)
-
-
 def test_allocations():
     tries = Runner.get_sample_size(3)
     skills_data = load_json_fixture("skills.json")
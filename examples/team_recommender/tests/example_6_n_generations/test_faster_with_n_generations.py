@@ -1,9 +1,10 @@
 import json
 
-from helpers import load_json_fixture
+from helpers import has_expected_success_rate, load_json_fixture
 from openai import OpenAI
 from settings import ROOT_DIR
 
+from cat_ai.batch_runner import BatchRunner
 from cat_ai.reporter import Reporter
 from cat_ai.runner import Runner
 
@@ -20,17 +21,6 @@ def get_developer_names_from_response(response) -> set[str]:
     return {developer["name"] for developer in response["developers"]}
 
 
-def has_expected_success_rate(results: list[bool], expected_success_rate: float) -> bool:
-    if not results:
-        return True
-
-    failure_count = sum(not result for result in results)
-    total_count = len(results)
-    failure_rate = float(failure_count) / float(total_count)
-    print(1.0 - failure_rate)
-    return expected_success_rate <= (1.0 - failure_rate)
-
-
 def test_fast_with_n_generations():
     generations = Runner.get_sample_size()
     skills_data = load_json_fixture("skills.json")
@@ -56,35 +46,33 @@ def test_fast_with_n_generations():
     client = OpenAI()
     assert client is not None
 
-    completion = client.chat.completions.create(
-        model="gpt-4-1106-preview",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": project_description},
-        ],
-        response_format={"type": "json_object"},
-        n=generations,
-    )
-    responses = completion.choices
-
-    results = []
-    for run in range(0, generations):
-        response = responses[run].message.content
-        test_reporter = Reporter(
+    def generate(n: int) -> list[str]:
+        completion = client.chat.completions.create(
+            model="gpt-4-1106-preview",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": project_description},
+            ],
+            response_format={"type": "json_object"},
+            n=n,
+        )
+        return [choice.message.content for choice in completion.choices]
+
+    test_runner = BatchRunner(
+        generate=generate,
+        validate=lambda reporter, response: run_allocation_test(
+            reporter, skills_data=skills_data, response=response
+        ),
+        reporter=Reporter(
             "test_fast_with_n_generations",
             metadata={
                 "system_prompt": system_prompt,
                 "user_prompt": project_description,
             },
             output_dir=ROOT_DIR,
-        )
-        test_runner = Runner(
-            lambda reporter, content=response: run_allocation_test(
-                reporter, skills_data=skills_data, response=content
-            ),
-            reporter=test_reporter,
-        )
-        results.append(test_runner.run_once(run))
+        ),
+    )
+    results = test_runner.run_multiple(generations)
 
     failure_threshold = 0.8
     assert has_expected_success_rate(results, failure_threshold)
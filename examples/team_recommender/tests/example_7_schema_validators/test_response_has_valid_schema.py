@@ -1,13 +1,15 @@
 import json
+from typing import List
 
 import openai
-from helpers import load_json_fixture
+from helpers import has_expected_success_rate, load_json_fixture
 from openai import OpenAI
 from openai.types.chat.chat_completion import Choice
 from response_matches_json_schema import response_matches_json_schema
 from retry import retry
 from settings import ROOT_DIR
 
+from cat_ai.batch_runner import BatchRunner
 from cat_ai.reporter import Reporter
 from cat_ai.runner import Runner
 
@@ -24,17 +26,6 @@ def get_developer_names_from_response(response) -> set[str]:
     return {developer["name"] for developer in response["developers"]}
 
 
-def has_expected_success_rate(results: list[bool], expected_success_rate: float) -> bool:
-    if not results:
-        return True
-
-    failure_count = sum(not result for result in results)
-    total_count = len(results)
-    failure_rate = float(failure_count) / float(total_count)
-    print(1.0 - failure_rate)
-    return expected_success_rate <= (1.0 - failure_rate)
-
-
 def test_response_has_valid_schema():
     generations = Runner.get_sample_size()
 
@@ -63,26 +54,24 @@ def test_response_has_valid_schema():
     client = OpenAI()
     assert client is not None
 
-    responses = generate_responses(client, generations, project_description, system_prompt)
-
-    results = []
-    for run in range(0, generations):
-        response = responses[run].message.content
-        test_reporter = Reporter(
+    test_runner = BatchRunner(
+        generate=lambda n: [
+            choice.message.content
+            for choice in generate_responses(client, n, project_description, system_prompt)
+        ],
+        validate=lambda reporter, response: run_allocation_test(
+            reporter, skills_data=skills_data, response=response
+        ),
+        reporter=Reporter(
             "test_fast_with_n_generations",
             metadata={
                 "system_prompt": system_prompt,
                 "user_prompt": project_description,
             },
             output_dir=ROOT_DIR,
-        )
-        test_runner = Runner(
-            lambda reporter, content=response: run_allocation_test(
-                reporter, skills_data=skills_data, response=content
-            ),
-            reporter=test_reporter,
-        )
-        results.append(test_runner.run_once(run))
+        ),
+    )
+    results = test_runner.run_multiple(generations)
 
     failure_threshold = 0.8
     assert has_expected_success_rate(results, failure_threshold)
@@ -93,7 +82,7 @@ def test_response_has_valid_schema():
     initial_delay=30,
     backoff_factor=1.5,
 )
-def generate_responses(client, generations, project_description, system_prompt) -> Choice:
+def generate_responses(client, generations, project_description, system_prompt) -> List[Choice]:
     completion = client.chat.completions.create(
         model="gpt-4-1106-preview",
         messages=[
@@ -3,13 +3,14 @@ import logging
 from typing import List
 
 import openai
-from helpers import load_json_fixture
+from helpers import has_expected_success_rate, load_json_fixture
 from jsonschema import FormatChecker, validate
 from openai import OpenAI
 from openai.types.chat.chat_completion import Choice
 from retry import retry
 from settings import root_dir
 
+from cat_ai.batch_runner import BatchRunner
 from cat_ai.reporter import Reporter
 from cat_ai.runner import Runner
 
@@ -42,17 +43,6 @@ def response_matches_json_schema(response: str, schema: any) -> bool:
         return False
 
 
-def has_expected_success_rate(results: list[bool], expected_success_rate: float) -> bool:
-    if not results:
-        return True
-
-    failure_count = sum(not result for result in results)
-    total_count = len(results)
-    failure_rate = float(failure_count) / float(total_count)
-    print(1.0 - failure_rate)
-    return expected_success_rate <= (1.0 - failure_rate)
-
-
 def test_response_pass_all_validations_and_retried():
     generations = Runner.get_sample_size()
 
@@ -79,26 +69,24 @@ def test_response_pass_all_validations_and_retried():
 
     logger = logging.getLogger("openai.api")
     logger.debug("Logging retries for OpenAI API")
-    responses = generate_choices(generations, project_description, system_prompt)
-
-    results = []
-    for run in range(0, generations):
-        response = responses[run].message.content
-        test_reporter = Reporter(
+    test_runner = BatchRunner(
+        generate=lambda n: [
+            choice.message.content
+            for choice in generate_choices(n, project_description, system_prompt)
+        ],
+        validate=lambda reporter, response: run_allocation_test(
+            reporter, skills_data=skills_data, response=response
+        ),
+        reporter=Reporter(
             f"test_retries_{generations}_generation{'' if generations == 1 else 's'}",
             metadata={
                 "system_prompt": system_prompt,
                 "user_prompt": project_description,
             },
             output_dir=root_dir(),
-        )
-        test_runner = Runner(
-            lambda reporter, content=response: run_allocation_test(
-                reporter, skills_data=skills_data, response=content
-            ),
-            reporter=test_reporter,
-        )
-        results.append(test_runner.run_once(run))
+        ),
+    )
+    results = test_runner.run_multiple(generations)
 
     failure_threshold = 0.8
     assert has_expected_success_rate(results, failure_threshold)
@@ -11,6 +11,7 @@ from response_matches_json_schema import response_matches_json_schema
 from retry import retry
 from settings import root_dir
 
+from cat_ai.batch_runner import BatchRunner
 from cat_ai.reporter import Reporter
 from cat_ai.runner import Runner
 
@@ -52,27 +53,25 @@ def test_metrics_within_range(setup_openai_logger):
     """
 
     setup_openai_logger.addHandler(logging.StreamHandler(sys.stdout))
-    responses = generate_choices(generations, project_description, system_prompt)
-
-    results = []
-    for run in range(0, generations):
-        response = responses[run].message.content
-        suffix = "" if generations == 1 else "s"
-        test_reporter = Reporter(
+    suffix = "" if generations == 1 else "s"
+    test_runner = BatchRunner(
+        generate=lambda n: [
+            choice.message.content
+            for choice in generate_choices(n, project_description, system_prompt)
+        ],
+        validate=lambda reporter, response: run_allocation_test(
+            reporter, skills_data=skills_data, response=response
+        ),
+        reporter=Reporter(
             f"test_metrics_{generations}_generation{suffix}",
             metadata={
                 "system_prompt": system_prompt,
                 "user_prompt": project_description,
             },
             output_dir=root_dir(),
-        )
-        test_runner = Runner(
-            lambda reporter, content=response: run_allocation_test(
-                reporter, skills_data=skills_data, response=content
-            ),
-            reporter=test_reporter,
-        )
-        results.append(test_runner.run_once(run))
+        ),
+    )
+    results = test_runner.run_multiple(generations)
 
     expected_success_rate_measured = 0.97
     failure_count = sum(not result for result in results)
@@ -5,7 +5,8 @@ from pathlib import Path
 
 from settings import root_path
 
-from cat_ai.statistical_analysis import analyse_measure_from_test_sample
+from cat_ai.interval_table import get_interval_table
+from cat_ai.outcomes import OutcomeCounters
 
 
 def load_json_fixture(file_name: str) -> dict:
@@ -27,17 +28,20 @@ def natural_sort_key(s: Path):
     ]
 
 
-def _assert_success_rate(actual: list[bool], expected: float):
-    number_of_successes = sum(1 for r in actual if r)
-    actual_success_rate = number_of_successes / len(actual)
+def _assert_success_rate(actual: list[bool] | OutcomeCounters, expected: float):
+    if isinstance(actual, OutcomeCounters):
+        number_of_successes, actual_count = actual.success_count, actual.sample_size
+    else:
+        number_of_successes, actual_count = sum(1 for r in actual if r), len(actual)
+    actual_success_rate = number_of_successes / actual_count
     assert actual_success_rate >= 0.0, (
         f"Cannot have less than 0% success rate, was: {actual_success_rate}"
     )
     assert actual_success_rate <= 1.0, (
         f"Cannot have more than 100% success rate, was: {actual_success_rate}"
     )
-    actual_count = len(actual)
-    success_analysis = analyse_measure_from_test_sample(number_of_successes, actual_count)
+    success_analysis = get_interval_table().analysis(number_of_successes, actual_count)
+    confidence = f"{success_analysis.confidence_level * 100:g}%"
     # Handle case when a list of results is passed
     lower_boundary = success_analysis.confidence_interval_prop[0]
     higher_boundary = success_analysis.confidence_interval_prop[1]
@@ -49,7 +53,7 @@ def _assert_success_rate(actual: list[bool], expected: float):
     step_down_alternative = f"or to {recommendation_to_decrease:.3f}"
     assert expected >= lower_boundary, f"""
         Broken Record: Adjust the expected success rate to at least {lower_boundary} {step_down_alternative}
-        New Success rate {success_analysis.proportion:.3f} with 90% confidence exceeds expected: {expected}
+        New Success rate {success_analysis.proportion:.3f} with {confidence} confidence exceeds expected: {expected}
         Expecting: {lower_boundary:.3f} <= {expected:.3f} <= {higher_boundary:.3f}
         Got: expected={expected} <= analysis.lower_interval={lower_boundary}
         """
@@ -61,13 +65,28 @@ def _assert_success_rate(actual: list[bool], expected: float):
     step_up_alternative = f"or to {recommendation_to_increase:.3f}"
     assert expected <= higher_boundary, f"""
         Broken Record: Adjust the expected success rate to at least {higher_boundary} {step_up_alternative}
-        Failure rate {success_analysis.proportion:.3f} not within 90% confidence of expected {expected}
-        New Success rate {success_analysis.proportion:.3f} with 90% confidence LOWER that expected: {expected}
+        Failure rate {success_analysis.proportion:.3f} not within {confidence} confidence of expected {expected}
+        New Success rate {success_analysis.proportion:.3f} with {confidence} confidence LOWER that expected: {expected}
         Expected value: {expected} is higher than higher_boundary: {higher_boundary:3f}
         Got: analysis.higher_boundary={higher_boundary:.3f} <= expected={expected}
         """
 
 
+def has_expected_success_rate(
+    results: list[bool] | OutcomeCounters, expected_success_rate: float
+) -> bool:
+    if isinstance(results, OutcomeCounters):
+        success_count, total_count = results.success_count, results.sample_size
+    else:
+        success_count, total_count = sum(1 for r in results if r), len(results)
+    if not total_count:
+        return True
+
+    success_rate = success_count / total_count
+    print(success_rate)
+    return expected_success_rate <= success_rate
+
+
 def failures_within_margin_of_error_from_expected(row: tuple[int, int, float]) -> str:
     return f"{row[0]} failures out of {row[1]} is within {row[2] * 100:.0f}% success rate"
 
@@ -93,7 +112,7 @@ def is_within_expected(success_rate: float, failure_count: int, sample_size: int
         return True
 
     expected_success_count = int(success_rate * sample_size)
-    success_analysis = analyse_measure_from_test_sample(expected_success_count, sample_size)
+    success_analysis = get_interval_table().analysis(expected_success_count, sample_size)
     measured_success_count = sample_size - failure_count
     measured_success_rate = measured_success_count / sample_size
 
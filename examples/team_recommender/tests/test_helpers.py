@@ -5,11 +5,13 @@ from helpers import (
     _assert_success_rate,
     failures_within_margin_of_error_from_expected,
     generate_examples,
+    has_expected_success_rate,
     is_statistically_significant,
     is_within_expected,
     natural_sort_key,
 )
 
+from cat_ai.outcomes import OutcomeCounters
 from cat_ai.statistical_analysis import analyse_measure_from_test_sample
 
 
@@ -326,3 +328,22 @@ def test_example_on_wiki():
     assert not is_within_expected(0.95, 1, next_size)
     assert not is_within_expected(next_rate, 0, next_size)
     assert is_within_expected(next_rate, 1, next_size)
+
+
+def test_assert_success_rate_accepts_outcome_counters():
+    counters = OutcomeCounters()
+    for passed in generate_examples(15, 100):
+        counters.add(passed)
+    _assert_success_rate(counters, 0.80)
+
+
+@pytest.mark.parametrize("expected_success_rate, expected", [(0.85, True), (0.86, False)])
+def test_has_expected_success_rate_of_results_or_counters(expected_success_rate, expected):
+    results = generate_examples(15, 100)
+    counters = OutcomeCounters()
+    for passed in results:
+        counters.add(passed)
+
+    assert has_expected_success_rate(results, expected_success_rate) is expected
+    assert has_expected_success_rate(counters, expected_success_rate) is expected
+    assert has_expected_success_rate([], expected_success_rate)
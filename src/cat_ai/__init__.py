@@ -1,10 +1,18 @@
+from .async_runner import AsyncRunner
+from .batch_runner import BatchRunner
+from .process_runner import ProcessPoolRunner
 from .reporter import Reporter
+from .response_cache import ResponseCache
 from .runner import Runner
 from .statistical_analysis import StatisticalAnalysis
 from .validator import Validator
 
 __all__ = [
+    "AsyncRunner",
+    "BatchRunner",
+    "ProcessPoolRunner",
     "Reporter",
+    "ResponseCache",
     "Runner",
     "Validator",
     "StatisticalAnalysis",
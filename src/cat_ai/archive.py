@@ -0,0 +1,163 @@
+import io
+import json
+import os
+import sys
+import tarfile
+import threading
+import time
+import zipfile
+from typing import Any, BinaryIO, Dict, Optional, cast
+
+from .sinks import ReportSink
+
+TAR_MODES = {
+    ".tar": "w",
+    ".tar.gz": "w:gz",
+    ".tgz": "w:gz",
+    ".tar.bz2": "w:bz2",
+    ".tar.xz": "w:xz",
+}
+
+
+class ArchiveWriter:
+    """
+    Write-once zip or tar archive filled one member at a time.
+
+    The format follows the file extension: .zip, .tar, .tar.gz, .tgz, .tar.bz2,
+    .tar.xz, or .tar.zst when the optional zstandard package is installed.
+    Files are copied into the archive in chunks, so memory stays bounded
+    whatever their size.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._tar: Optional[tarfile.TarFile] = None
+        self._stream: Optional[BinaryIO] = None
+
+        if path.endswith(".zip"):
+            self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+        elif path.endswith(".tar.zst"):
+            try:
+                import zstandard  # type: ignore[import-not-found]
+            except ImportError as error:
+                raise RuntimeError(
+                    "Writing .tar.zst archives needs the zstandard package"
+                ) from error
+            self._stream = zstandard.ZstdCompressor().stream_writer(open(path, "wb"))
+            self._tar = tarfile.open(fileobj=self._stream, mode="w|")
+        else:
+            mode = next((m for suffix, m in TAR_MODES.items() if path.endswith(suffix)), None)
+            if mode is None:
+                raise ValueError(f"Unknown archive format for '{path}'")
+            self._tar = tarfile.open(path, cast(Any, mode))
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def add_file(self, path: str, name: str) -> None:
+        """Copy a file from disk into the archive under the given member name."""
+        with self._lock:
+            if self._zip:
+                self._zip.write(path, name)
+            elif self._tar:
+                self._tar.add(path, name, recursive=False)
+
+    def add_bytes(self, name: str, content: bytes) -> None:
+        """Add in-memory content to the archive under the given member name."""
+        with self._lock:
+            if self._zip:
+                self._zip.writestr(name, content)
+            elif self._tar:
+                info = tarfile.TarInfo(name)
+                info.size = len(content)
+                info.mtime = int(time.time())
+                self._tar.addfile(info, io.BytesIO(content))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._zip:
+                self._zip.close()
+            if self._tar:
+                self._tar.close()
+            if self._stream:
+                self._stream.close()
+            self._zip = self._tar = self._stream = None
+
+
+class ArchiveSink(ReportSink):
+    """
+    Run records streamed straight into an archive as the Reporter produces them.
+
+    Each record becomes a <test run folder>/<output_file> member, next to the
+    test run's metadata.json, so the archive has the same layout as test_runs.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Initialize the ArchiveSink with the archive to create.
+
+        Args:
+            path: Archive file, its extension selects the format
+        """
+        self.writer = ArchiveWriter(path)
+        self._archived_metadata: set[str] = set()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        folder_name = os.path.basename(record["folder_path"])
+        metadata_path = record.get("metadata_path")
+        if folder_name not in self._archived_metadata and metadata_path:
+            self._archived_metadata.add(folder_name)
+            if os.path.exists(metadata_path):
+                self.writer.add_file(metadata_path, f"{folder_name}/metadata.json")
+        content = json.dumps(record, indent=4).encode("utf-8")
+        self.writer.add_bytes(f"{folder_name}/{record['output_file']}", content)
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+def archive_directory(
+    source_dir: str, archive_path: str, arcname_root: Optional[str] = None
+) -> int:
+    """
+    Archive a directory, such as test_runs, in a single pass without temporary copies.
+
+    Args:
+        source_dir: Directory to archive, member names are relative to it
+        archive_path: Archive file to create, its extension selects the format
+        arcname_root: Path prepended to every member name, for example
+                      examples/team_recommender/test_runs to match the layout
+                      of `zip -r` run from the repository root
+
+    Returns:
+        Number of archived files
+    """
+    archive_real_path = os.path.realpath(archive_path)
+    count = 0
+    with ArchiveWriter(archive_path) as writer:
+        for folder, dir_names, file_names in os.walk(source_dir):
+            dir_names.sort()
+            for file_name in sorted(file_names):
+                path = os.path.join(folder, file_name)
+                if file_name.endswith(".tmp") or os.path.realpath(path) == archive_real_path:
+                    continue
+                name = os.path.relpath(path, source_dir).replace(os.sep, "/")
+                if arcname_root:
+                    name = f"{arcname_root.strip('/')}/{name}"
+                writer.add_file(path, name)
+                count += 1
+    return count
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (3, 4):
+        print("Usage: python -m cat_ai.archive source_dir archive_path [arcname_root]")
+        sys.exit(1)
+
+    archived = archive_directory(*sys.argv[1:])
+    print(f"Archived {archived} files into {sys.argv[2]}")
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+
+from .rate_limiter import RateLimiter, get_rate_limiter
+from .reporter import Reporter
+from .runner import Runner
+from .shards import Shard
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRunner:
+    """Executes coroutine test functions concurrently and collects results using a reporter."""
+
+    def __init__(
+        self,
+        test_function: Callable[[Reporter], Awaitable[bool]],
+        reporter: Reporter,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        tokens_per_run: int = 0,
+        shard: Optional[Shard] = None,
+    ) -> None:
+        """
+        Initialize the AsyncRunner with a coroutine test function and reporter.
+
+        Args:
+            test_function: Coroutine function to await during test runs
+            reporter: Reporter instance to track and report test results
+            max_concurrency: Number of runs awaited at the same time, defaults to
+                             value from Runner.get_concurrency() if None
+            timeout: Seconds a single run may take before it is cancelled and
+                     recorded as a timeout, defaults to value from
+                     Runner.get_timeout() if None
+            rate_limiter: Budget to acquire before every run, defaults to the
+                          process-wide limiter from get_rate_limiter()
+            tokens_per_run: Estimated tokens one run spends on generation
+            shard: Slice of run numbers run_multiple executes, defaults to
+                   value from Shard.from_env() if None
+        """
+        self.reporter = reporter
+        self.test_function = test_function
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout if timeout is not None else Runner.get_timeout()
+        self.rate_limiter = rate_limiter
+        self.tokens_per_run = tokens_per_run
+        self.shard = shard or Shard.from_env()
+
+    async def run_once(self, run_number: int = 0) -> bool:
+        """
+        Await the test function once.
+
+        Args:
+            run_number: Current run index for reporting
+
+        Returns:
+            Result from the test function, False if the run timed out
+        """
+        rate_limiter = self.rate_limiter or get_rate_limiter()
+        if rate_limiter:
+            await rate_limiter.acquire_async(self.tokens_per_run)
+        run_reporter = self.reporter.for_run(run_number)
+        try:
+            return await asyncio.wait_for(self.test_function(run_reporter), self.timeout)
+        except TimeoutError:
+            logger.warning(f"Run {run_number} timed out after {self.timeout}s")
+            return await asyncio.to_thread(run_reporter.report_timeout, self.timeout or 0)
+
+    async def run_multiple(
+        self, sample_size: Optional[int] = None, max_concurrency: Optional[int] = None
+    ) -> List[bool]:
+        """
+        Await the test function multiple times based on sample size.
+
+        At most max_concurrency runs are in flight at once. Cancelling the
+        returned coroutine cancels every run that has not finished yet. The
+        reporter's validation summary is written once all runs finish. With a
+        shard only its slice of the run numbers is awaited.
+
+        Args:
+            sample_size: Number of times to run the test, defaults to
+                         value from Runner.get_sample_size() if None
+            max_concurrency: Number of runs awaited at the same time, overrides
+                             the value given to the constructor
+
+        Returns:
+            List of results from all test runs, ordered by run number
+        """
+        runs = sample_size if sample_size is not None else Runner.get_sample_size()
+        run_numbers = self.shard.run_numbers(runs) if self.shard else range(runs)
+        limit = max_concurrency or self.max_concurrency or Runner.get_concurrency()
+        semaphore = asyncio.Semaphore(max(limit, 1))
+
+        async def limited_run(run_number: int) -> bool:
+            async with semaphore:
+                return await self.run_once(run_number)
+
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(limited_run(i)) for i in run_numbers]
+        await asyncio.to_thread(self.reporter.write_validation_summary, self.shard)
+        return [task.result() for task in tasks]
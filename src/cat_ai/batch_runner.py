@@ -0,0 +1,135 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .rate_limiter import RateLimiter, get_rate_limiter
+from .reporter import Reporter
+from .response_cache import ResponseCache
+from .runner import Runner
+from .shards import Shard
+
+logger = logging.getLogger(__name__)
+
+
+class BatchRunner:
+    """Generates many responses per request and validates each one as a separate run."""
+
+    def __init__(
+        self,
+        generate: Callable[[int], Sequence[str]],
+        validate: Callable[[Reporter, str], bool],
+        reporter: Reporter,
+        max_generations: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        tokens_per_run: int = 0,
+        cache: Optional[ResponseCache] = None,
+        cache_request: Optional[Dict[str, Any]] = None,
+        shard: Optional[Shard] = None,
+    ) -> None:
+        """
+        Initialize the BatchRunner with a batch generator and a validation function.
+
+        Args:
+            generate: Function returning the given number of responses from one
+                      request, for example the choices of a completion with n set
+            validate: Function validating and reporting one response
+            reporter: Reporter instance to track and report test results
+            max_generations: Largest number of responses one request may return,
+                             defaults to value from get_max_generations() if None
+            max_workers: Number of requests issued concurrently, defaults to
+                         value from Runner.get_concurrency() if None
+            rate_limiter: Budget to acquire before every request, defaults to the
+                          process-wide limiter from get_rate_limiter()
+            tokens_per_run: Estimated tokens one response spends on generation
+            cache: Cassette recording or replaying the generated responses
+            cache_request: Model, messages and parameters identifying the
+                           request in the cache
+            shard: Slice of run numbers run_multiple executes, defaults to
+                   value from Shard.from_env() if None
+        """
+        self.generate = generate
+        self.validate = validate
+        self.reporter = reporter
+        self.max_generations = max_generations
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter
+        self.tokens_per_run = tokens_per_run
+        self.cache = cache
+        self.cache_request = cache_request or {}
+        self.shard = shard or Shard.from_env()
+
+    @staticmethod
+    def get_max_generations(default_generations: int = 128) -> int:
+        """
+        Get the largest number of responses one request may return.
+
+        Args:
+            default_generations: Default limit if not specified in environment,
+                                 128 is the largest n OpenAI accepts
+
+        Returns:
+            Number of responses per request
+        """
+        return int(os.getenv("CAT_AI_MAX_GENERATIONS", str(default_generations)))
+
+    def generate_batch(self, run_numbers: Sequence[int]) -> List[str]:
+        """
+        Get one batch of responses, from the cache when it has them.
+
+        Args:
+            run_numbers: Run indexes the responses belong to
+
+        Returns:
+            Responses for the batch
+        """
+        if self.cache:
+            return self.cache.fetch_batch(self.cache_request, run_numbers, self._generate)
+        return self._generate(len(run_numbers))
+
+    def _generate(self, size: int) -> List[str]:
+        rate_limiter = self.rate_limiter or get_rate_limiter()
+        if rate_limiter:
+            rate_limiter.acquire(self.tokens_per_run * size)
+        responses = list(self.generate(size))
+        if len(responses) != size:
+            logger.warning(f"Requested {size} responses, got {len(responses)}")
+        return responses
+
+    def run_multiple(self, sample_size: Optional[int] = None) -> List[bool]:
+        """
+        Generate and validate responses until the sample size is reached.
+
+        The sample size is split into requests of at most max_generations
+        responses each, which are issued concurrently. Every response is then
+        validated as its own run, and the reporter's validation summary is
+        written at the end. With a shard only its slice of the run numbers is
+        generated and validated.
+
+        Args:
+            sample_size: Number of responses to validate, defaults to
+                         value from Runner.get_sample_size() if None
+
+        Returns:
+            List of validation results, ordered by run number
+        """
+        runs = sample_size if sample_size is not None else Runner.get_sample_size()
+        run_numbers = self.shard.run_numbers(runs) if self.shard else range(runs)
+        batch_limit = max(self.max_generations or self.get_max_generations(), 1)
+        batches = [
+            run_numbers[start : start + batch_limit]
+            for start in range(0, len(run_numbers), batch_limit)
+        ]
+        workers = self.max_workers or Runner.get_concurrency(default_workers=len(batches))
+
+        with ThreadPoolExecutor(max_workers=max(min(workers, len(batches)), 1)) as executor:
+            batch_responses = list(executor.map(self.generate_batch, batches))
+
+        results = [
+            self.validate(self.reporter.for_run(run_number), response)
+            for batch, responses in zip(batches, batch_responses, strict=True)
+            for run_number, response in zip(batch, responses, strict=False)
+        ]
+        self.reporter.write_validation_summary(self.shard)
+        return results
@@ -0,0 +1,115 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict
+
+BLOB_REF_KEY = "$blob"
+BLOBS_DIR_NAME = "blobs"
+
+
+class BlobStore:
+    """
+    Content-addressed store of gzip-compressed JSON values.
+
+    Every value is written once under the SHA-256 of its JSON form, so prompts
+    and responses repeated across runs and test runs take the space of one copy.
+    Records refer to stored values with {"$blob": "<sha256>"}.
+    """
+
+    def __init__(self, root: str, min_size: int = 256) -> None:
+        """
+        Initialize the BlobStore with its folder.
+
+        Args:
+            root: Folder holding the blobs, usually test_runs/blobs
+            min_size: Values whose JSON form is shorter stay inline in records
+        """
+        self.root = root
+        self.min_size = min_size
+
+    def put(self, value: Any) -> str:
+        """
+        Store a JSON serializable value unless it is already stored.
+
+        Args:
+            value: Value to store
+
+        Returns:
+            SHA-256 hex digest addressing the value
+        """
+        return self._put(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+
+    def get(self, digest: str) -> Any:
+        """
+        Load a stored value.
+
+        Args:
+            digest: SHA-256 hex digest returned by put()
+
+        Returns:
+            Stored value
+        """
+        with gzip.open(self._path(digest), "rb") as file:
+            return json.loads(file.read())
+
+    def externalize(self, value: Any) -> Any:
+        """
+        Replace a large value by a reference to its stored copy.
+
+        Args:
+            value: JSON serializable value
+
+        Returns:
+            {"$blob": digest} for values of at least min_size bytes, otherwise the value itself
+        """
+        content = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        if len(content) < self.min_size:
+            return value
+        return {BLOB_REF_KEY: self._put(content)}
+
+    def resolve(self, value: Any) -> Any:
+        """
+        Replace blob references inside a value by the stored values.
+
+        Args:
+            value: Value that may contain {"$blob": digest} references
+
+        Returns:
+            Value with every reference resolved
+        """
+        if isinstance(value, dict):
+            if set(value) == {BLOB_REF_KEY}:
+                return self.get(value[BLOB_REF_KEY])
+            return {key: self.resolve(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.resolve(item) for item in value]
+        return value
+
+    def externalize_values(self, mapping: Dict[str, Any]) -> Dict[str, Any]:
+        """Externalize every value of a mapping, such as report metadata."""
+        return {key: self.externalize(value) for key, value in mapping.items()}
+
+    def _put(self, content: bytes) -> str:
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as file:
+                file.write(gzip.compress(content, mtime=0))
+            os.replace(temp_path, path)
+        return digest
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], f"{digest}.json.gz")
+
+
+def contains_blob_refs(value: Any) -> bool:
+    """Check whether a value holds any {"$blob": digest} reference."""
+    if isinstance(value, dict):
+        return set(value) == {BLOB_REF_KEY} or any(contains_blob_refs(v) for v in value.values())
+    if isinstance(value, list):
+        return any(contains_blob_refs(item) for item in value)
+    return False
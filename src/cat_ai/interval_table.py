@@ -0,0 +1,158 @@
+import atexit
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .sinks import atomic_write
+from .statistical_analysis import (
+    StatisticalAnalysis,
+    analyse_measure_from_test_sample,
+    analysis_columns,
+    get_confidence_level,
+    get_interval_method,
+)
+
+TABLE_FORMAT_VERSION = 1
+
+
+class IntervalTable:
+    """
+    Analyses of every (failures, sample size) pair up to a maximum sample size.
+
+    The analyses of a sample size are computed together the first time one of
+    them is looked up, so the threshold checks of a whole test suite become
+    lookups. With a cache file the computed rows are loaded at start and saved
+    at exit, and later sessions skip the computation.
+    """
+
+    def __init__(
+        self,
+        max_sample_size: int = 1000,
+        confidence_level: Optional[float] = None,
+        cache_path: Optional[str] = None,
+        method: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize the IntervalTable, loading rows cached by an earlier session.
+
+        Args:
+            max_sample_size: Largest sample size kept in the table, larger samples
+                             are analysed on every lookup
+            confidence_level: Confidence level of the intervals, defaults to
+                              value from get_confidence_level() if None
+            cache_path: JSON file the computed rows are persisted to
+            method: Interval method, defaults to value from get_interval_method() if None
+        """
+        self.max_sample_size = max_sample_size
+        self.confidence_level = (
+            confidence_level if confidence_level is not None else get_confidence_level()
+        )
+        self.method = method or get_interval_method()
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        self._rows: Dict[int, List[Sequence[Any]]] = {}
+        self._dirty = False
+        if cache_path:
+            self._load()
+            atexit.register(self.save)
+
+    def analysis(self, measure: int, sample_size: int) -> StatisticalAnalysis:
+        """
+        Look up the analysis of a sample.
+
+        Args:
+            measure: Number of failures (or successes) in the sample
+            sample_size: Total size of the sample
+
+        Returns:
+            StatisticalAnalysis: Same result as analyse_measure_from_test_sample()
+        """
+        if not (0 <= measure <= sample_size and 0 < sample_size <= self.max_sample_size):
+            return analyse_measure_from_test_sample(
+                measure, sample_size, self.confidence_level, self.method
+            )
+        row = self._rows.get(sample_size) or self._compute_rows(sample_size)
+        return StatisticalAnalysis.from_csv_row(row[measure], self.confidence_level, self.method)
+
+    def confidence_interval_count(self, measure: int, sample_size: int) -> Tuple[int, int]:
+        """Look up the confidence interval of a sample as counts."""
+        return self.analysis(measure, sample_size).confidence_interval_count
+
+    def _compute_rows(self, sample_size: int) -> List[Sequence[Any]]:
+        with self._lock:
+            if sample_size not in self._rows:
+                columns = analysis_columns(
+                    range(sample_size + 1),
+                    [sample_size] * (sample_size + 1),
+                    confidence_level=self.confidence_level,
+                    method=self.method,
+                )
+                values = [_as_list(column) for column in columns.values()]
+                self._rows[sample_size] = list(zip(*values, strict=True))
+                self._dirty = True
+            return self._rows[sample_size]
+
+    def save(self) -> None:
+        """Persist the rows computed so far to the cache file."""
+        if not self.cache_path or not self._dirty:
+            return
+        with self._lock:
+            content = {
+                "version": TABLE_FORMAT_VERSION,
+                "confidence_level": self.confidence_level,
+                "method": self.method,
+                "rows": {str(size): rows for size, rows in self._rows.items()},
+            }
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+            atomic_write(self.cache_path, json.dumps(content, separators=(",", ":")))
+            self._dirty = False
+
+    def _load(self) -> None:
+        assert self.cache_path
+        try:
+            with open(self.cache_path, encoding="utf-8") as file:
+                content = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if (
+            content.get("version") != TABLE_FORMAT_VERSION
+            or content.get("confidence_level") != self.confidence_level
+            or content.get("method", "normal") != self.method
+        ):
+            return  # computed for another level, method or layout, rebuilt when looked up
+        self._rows = {
+            int(size): [tuple(row) for row in rows]
+            for size, rows in content["rows"].items()
+            if int(size) <= self.max_sample_size
+        }
+
+
+def _as_list(column: Sequence[Any]) -> List[Any]:
+    return column.tolist() if hasattr(column, "tolist") else list(column)
+
+
+_tables: Dict[Tuple[float, str], IntervalTable] = {}
+_tables_lock = threading.Lock()
+
+
+def get_interval_table() -> IntervalTable:
+    """
+    Get the process-wide interval table of the current confidence level and method.
+
+    CAT_AI_INTERVAL_TABLE_SIZE sets the largest sample size kept in the table
+    (default 1000) and CAT_AI_INTERVAL_TABLE_FILE the file it is cached in.
+
+    Returns:
+        IntervalTable shared by every caller in this process
+    """
+    key = (get_confidence_level(), get_interval_method())
+    with _tables_lock:
+        if key not in _tables:
+            _tables[key] = IntervalTable(
+                max_sample_size=int(os.getenv("CAT_AI_INTERVAL_TABLE_SIZE", "1000")),
+                confidence_level=key[0],
+                cache_path=os.getenv("CAT_AI_INTERVAL_TABLE_FILE") or None,
+                method=key[1],
+            )
+        return _tables[key]
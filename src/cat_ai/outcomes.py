@@ -0,0 +1,214 @@
+import threading
+from dataclasses import replace
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .statistical_analysis import SampleAccumulator, StatisticalAnalysis
+
+
+class OutcomeBitset:
+    """
+    Pass/fail history of runs, stored in two bits per run number.
+
+    A million runs take 250 kB instead of the 8 MB of a list of booleans.
+    """
+
+    def __init__(self) -> None:
+        self._recorded = bytearray()
+        self._passed = bytearray()
+        self._count = 0
+
+    def set(self, run_number: int, passed: bool) -> None:
+        """
+        Record the outcome of a run, replacing an earlier outcome of the same run.
+
+        Args:
+            run_number: Non-negative run index
+            passed: Whether the run passed
+        """
+        if run_number < 0:
+            raise ValueError(f"Run number must not be negative, got {run_number}")
+        index, bit = divmod(run_number, 8)
+        if index >= len(self._recorded):
+            grow_by = index + 1 - len(self._recorded)
+            self._recorded.extend(bytes(grow_by))
+            self._passed.extend(bytes(grow_by))
+        mask = 1 << bit
+        if not self._recorded[index] & mask:
+            self._recorded[index] |= mask
+            self._count += 1
+        if passed:
+            self._passed[index] |= mask
+        else:
+            self._passed[index] &= ~mask
+
+    def get(self, run_number: int) -> Optional[bool]:
+        """
+        Get the outcome of a run.
+
+        Args:
+            run_number: Run index
+
+        Returns:
+            Whether the run passed, None when it has no recorded outcome
+        """
+        index, bit = divmod(run_number, 8)
+        if run_number < 0 or index >= len(self._recorded):
+            return None
+        mask = 1 << bit
+        if not self._recorded[index] & mask:
+            return None
+        return bool(self._passed[index] & mask)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Tuple[int, bool]]:
+        """Yield the run number and outcome of every recorded run in run order."""
+        for index, recorded in enumerate(self._recorded):
+            if not recorded:
+                continue
+            for bit in range(8):
+                if recorded & (1 << bit):
+                    yield index * 8 + bit, bool(self._passed[index] & (1 << bit))
+
+    def failed_runs(self) -> List[int]:
+        """Get the run numbers of every recorded run that failed."""
+        return [run_number for run_number, passed in self if not passed]
+
+
+class OutcomeCounters:
+    """
+    Pass and failure counts of a test, overall and per validation name.
+
+    Each count is a SampleAccumulator, updated as runs finish, so counters use
+    the same memory for a hundred or a million runs unless the per-run history
+    is kept in an OutcomeBitset. They are safe to update from concurrent runs,
+    and counters of separate workers or shards can be merged.
+    """
+
+    def __init__(self, keep_history: bool = False) -> None:
+        """
+        Initialize empty counters.
+
+        Args:
+            keep_history: Also keep the outcome of every run number in an OutcomeBitset
+        """
+        self._lock = threading.Lock()
+        self._runs = SampleAccumulator()
+        self._validations: Dict[str, SampleAccumulator] = {}
+        self.history: Optional[OutcomeBitset] = OutcomeBitset() if keep_history else None
+
+    @property
+    def sample_size(self) -> int:
+        return self._runs.sample_size
+
+    @property
+    def failure_count(self) -> int:
+        return self._runs.failure_count
+
+    @property
+    def success_count(self) -> int:
+        return self._runs.success_count
+
+    @property
+    def validation_names(self) -> List[str]:
+        """Names of the validations counted so far, in the order they were first seen."""
+        with self._lock:
+            return list(self._validations)
+
+    def add(self, passed: bool, run_number: Optional[int] = None) -> None:
+        """
+        Count the outcome of a run.
+
+        Args:
+            passed: Whether the run passed
+            run_number: Run index kept in the history, if the history is kept
+        """
+        with self._lock:
+            self._count_run(passed, run_number)
+
+    def add_validations(self, results: Dict[str, bool], run_number: Optional[int] = None) -> bool:
+        """
+        Count the outcome of every validation of a run, and of the run itself.
+
+        Args:
+            results: Validation name to outcome mapping, as given to Reporter.report()
+            run_number: Run index kept in the history, if the history is kept
+
+        Returns:
+            bool: True when all validations passed
+        """
+        passed = all(results.values())
+        with self._lock:
+            for name, value in results.items():
+                self._validations.setdefault(name, SampleAccumulator()).add(bool(value))
+            self._count_run(passed, run_number)
+        return passed
+
+    def _count_run(self, passed: bool, run_number: Optional[int]) -> None:
+        self._runs.add(passed)
+        if self.history is not None and run_number is not None:
+            self.history.set(run_number, passed)
+
+    def accumulator(self, validation_name: Optional[str] = None) -> SampleAccumulator:
+        """
+        Get a snapshot of the counts of the runs or of one validation.
+
+        Args:
+            validation_name: Validation to count, None for whole runs
+
+        Returns:
+            SampleAccumulator: Copy of the counts, empty for an unknown validation
+        """
+        with self._lock:
+            if validation_name is None:
+                return replace(self._runs)
+            return replace(self._validations.get(validation_name, SampleAccumulator()))
+
+    def counts(self, validation_name: Optional[str] = None) -> Tuple[int, int]:
+        """
+        Get the failure count and sample size of the runs or of one validation.
+
+        Args:
+            validation_name: Validation to count, None for whole runs
+
+        Returns:
+            Failure count and number of counted outcomes
+        """
+        accumulator = self.accumulator(validation_name)
+        return accumulator.failure_count, accumulator.sample_size
+
+    def merge(self, other: "OutcomeCounters") -> None:
+        """
+        Add the counts of other counters, such as those of another worker or shard.
+
+        Args:
+            other: Counters whose counts and history are added to these
+        """
+        with other._lock:
+            runs = replace(other._runs)
+            validations = {name: replace(counts) for name, counts in other._validations.items()}
+            history = list(other.history) if other.history is not None else []
+        with self._lock:
+            self._runs = self._runs.merge(runs)
+            for name, counts in validations.items():
+                self._validations[name] = self._validations.get(name, SampleAccumulator()) + counts
+            if self.history is not None:
+                for run_number, passed in history:
+                    self.history.set(run_number, passed)
+
+    def analysis(self, validation_name: Optional[str] = None) -> StatisticalAnalysis:
+        """
+        Analyse the failures counted so far.
+
+        Args:
+            validation_name: Validation to analyse, None for whole runs
+
+        Returns:
+            StatisticalAnalysis: Failure analysis of the counted outcomes
+        """
+        accumulator = self.accumulator(validation_name)
+        if not accumulator.sample_size:
+            subject = f"validation '{validation_name}'" if validation_name else "runs"
+            raise ValueError(f"No outcomes of {subject} counted")
+        return accumulator.analysis()
@@ -0,0 +1,137 @@
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
+
+from .rate_limiter import RateLimiter, get_rate_limiter
+from .reporter import Reporter
+from .runner import Runner
+from .shards import Shard
+
+
+class ProcessPoolRunner:
+    """
+    Generates responses on threads and validates them in worker processes.
+
+    Suits CPU-bound validation such as schema checks over large payloads or
+    embedding math, which threads cannot spread over cores. The check function
+    must be picklable, for example defined at module level, and only the
+    response and the validation results cross the process boundary. Reports are
+    written by the parent process, so the Reporter layout is unchanged.
+
+    Worker processes are started with forkserver, or spawn where it is not
+    available, never fork: forking while the generator threads run could copy
+    locks they hold, such as the logging or rate limiter locks, and deadlock
+    the workers.
+    """
+
+    def __init__(
+        self,
+        generate: Callable[[int], str],
+        check: Callable[[str], Dict[str, bool]],
+        reporter: Reporter,
+        max_workers: Optional[int] = None,
+        process_workers: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        tokens_per_run: int = 0,
+        shard: Optional[Shard] = None,
+    ) -> None:
+        """
+        Initialize the ProcessPoolRunner with a generator and a check function.
+
+        Args:
+            generate: Function returning the response of the given run number
+            check: Picklable function returning validation name to outcome for a response
+            reporter: Reporter instance to track and report test results
+            max_workers: Number of responses generated concurrently, defaults to
+                         value from Runner.get_concurrency() if None
+            process_workers: Number of validation processes, defaults to value
+                             from get_process_workers() if None
+            rate_limiter: Budget to acquire before every generation, defaults to
+                          the process-wide limiter from get_rate_limiter()
+            tokens_per_run: Estimated tokens one generation spends
+            shard: Slice of run numbers run_multiple executes, defaults to
+                   value from Shard.from_env() if None
+        """
+        self.generate = generate
+        self.check = check
+        self.reporter = reporter
+        self.max_workers = max_workers
+        self.process_workers = process_workers
+        self.rate_limiter = rate_limiter
+        self.tokens_per_run = tokens_per_run
+        self.shard = shard or Shard.from_env()
+
+    @staticmethod
+    def get_process_workers() -> int:
+        """
+        Get the number of validation processes from environment variable or the CPU count.
+
+        Returns:
+            Number of worker processes
+        """
+        return int(os.getenv("CAT_AI_PROCESS_WORKERS", str(os.cpu_count() or 1)))
+
+    def generate_once(self, run_number: int) -> str:
+        """
+        Generate the response of one run.
+
+        Args:
+            run_number: Current run index
+
+        Returns:
+            Generated response
+        """
+        rate_limiter = self.rate_limiter or get_rate_limiter()
+        if rate_limiter:
+            rate_limiter.acquire(self.tokens_per_run)
+        return self.generate(run_number)
+
+    def run_multiple(self, sample_size: Optional[int] = None) -> List[bool]:
+        """
+        Generate, validate and report responses until the sample size is reached.
+
+        Each response is sent to a worker process as soon as it is generated,
+        so validation overlaps with the remaining generation. The reporter's
+        validation summary is written at the end. With a shard only its slice
+        of the run numbers is executed.
+
+        Args:
+            sample_size: Number of runs, defaults to value from
+                         Runner.get_sample_size() if None
+
+        Returns:
+            List of results from all test runs, ordered by run number
+        """
+        runs = sample_size if sample_size is not None else Runner.get_sample_size()
+        run_numbers = self.shard.run_numbers(runs) if self.shard else range(runs)
+        if not run_numbers:
+            return []
+        threads = max(self.max_workers or Runner.get_concurrency(), 1)
+        processes = max(self.process_workers or self.get_process_workers(), 1)
+
+        checks: Dict[int, Future] = {}
+        responses: Dict[int, str] = {}
+        with (
+            ThreadPoolExecutor(max_workers=min(threads, len(run_numbers))) as generators,
+            ProcessPoolExecutor(
+                max_workers=min(processes, len(run_numbers)), mp_context=_worker_context()
+            ) as validators,
+        ):
+            generations = {generators.submit(self.generate_once, i): i for i in run_numbers}
+            for generation in as_completed(generations):
+                run_number = generations[generation]
+                responses[run_number] = generation.result()
+                checks[run_number] = validators.submit(self.check, responses[run_number])
+
+            results = [
+                self.reporter.for_run(i).report(responses[i], checks[i].result())
+                for i in run_numbers
+            ]
+        self.reporter.write_validation_summary(self.shard)
+        return results
+
+
+def _worker_context() -> multiprocessing.context.BaseContext:
+    start_methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in start_methods else "spawn")
@@ -0,0 +1,211 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+
+@dataclass
+class TokenBucket:
+    """Token bucket that refills continuously up to a per-minute capacity."""
+
+    per_minute: float
+    level: float
+    updated: float
+
+    def refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated)
+        self.level = min(self.per_minute, self.level + elapsed * self.per_minute / 60.0)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until the bucket holds the requested amount."""
+        missing = amount - self.level
+        return 0.0 if missing <= 0 else missing * 60.0 / self.per_minute
+
+
+class RateLimiter:
+    """
+    Shared request and token budget for LLM calls.
+
+    Limits requests per minute and tokens per minute with token buckets. When a
+    state_path is given the bucket levels live in that file and are updated under
+    an exclusive file lock, so separate processes share the same budget.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        state_path: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the RateLimiter with per-minute limits.
+
+        Args:
+            requests_per_minute: Requests allowed per minute, unlimited if None
+            tokens_per_minute: Tokens allowed per minute, unlimited if None
+            state_path: File used to share the budget between processes
+            clock: Source of the current time in seconds
+        """
+        if state_path is not None and fcntl is None:
+            raise RuntimeError("Sharing a rate limit between processes needs fcntl file locks")
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.state_path = state_path
+        self.clock = clock
+        self._lock = threading.Lock()
+        now = clock()
+        self._buckets = {
+            name: TokenBucket(per_minute=limit, level=limit, updated=now)
+            for name, limit in self._limits().items()
+        }
+
+    @classmethod
+    def from_env(cls) -> Optional["RateLimiter"]:
+        """
+        Create a rate limiter from environment variables.
+
+        Reads CAT_AI_REQUESTS_PER_MINUTE, CAT_AI_TOKENS_PER_MINUTE and
+        CAT_AI_RATE_LIMIT_FILE.
+
+        Returns:
+            RateLimiter or None when no limit is configured
+        """
+        requests_per_minute = os.getenv("CAT_AI_REQUESTS_PER_MINUTE")
+        tokens_per_minute = os.getenv("CAT_AI_TOKENS_PER_MINUTE")
+        if not requests_per_minute and not tokens_per_minute:
+            return None
+        return cls(
+            requests_per_minute=float(requests_per_minute) if requests_per_minute else None,
+            tokens_per_minute=float(tokens_per_minute) if tokens_per_minute else None,
+            state_path=os.getenv("CAT_AI_RATE_LIMIT_FILE") or None,
+        )
+
+    def acquire(self, tokens: int = 0) -> None:
+        """
+        Block until one request and the given number of tokens fit in the budget.
+
+        Args:
+            tokens: Estimated number of tokens the request will use
+        """
+        while (wait := self.reserve(tokens)) > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int = 0) -> None:
+        """
+        Wait without blocking the event loop until a request fits in the budget.
+
+        Args:
+            tokens: Estimated number of tokens the request will use
+        """
+        while (wait := self.reserve(tokens)) > 0:
+            await asyncio.sleep(wait)
+
+    def reserve(self, tokens: int = 0) -> float:
+        """
+        Take one request and the given tokens from the budget if they fit.
+
+        Args:
+            tokens: Estimated number of tokens the request will use
+
+        Returns:
+            0 when the budget was taken, otherwise seconds to wait before retrying
+        """
+        amounts = {"requests": 1.0, "tokens": float(tokens)}
+        for name, bucket in self._buckets.items():
+            if amounts[name] > bucket.per_minute:
+                raise ValueError(
+                    f"Cannot reserve {amounts[name]} {name}, limit is {bucket.per_minute}"
+                )
+
+        with self._lock, self._shared_state():
+            now = self.clock()
+            for bucket in self._buckets.values():
+                bucket.refill(now)
+            wait = max(
+                (bucket.wait_time(amounts[name]) for name, bucket in self._buckets.items()),
+                default=0.0,
+            )
+            if wait == 0:
+                for name, bucket in self._buckets.items():
+                    bucket.level -= amounts[name]
+            return wait
+
+    def _limits(self) -> Dict[str, float]:
+        limits = {"requests": self.requests_per_minute, "tokens": self.tokens_per_minute}
+        return {name: limit for name, limit in limits.items() if limit}
+
+    @contextmanager
+    def _shared_state(self) -> Iterator[None]:
+        if self.state_path is None:
+            yield
+            return
+
+        with open(self.state_path, "a+") as state_file:
+            fcntl.flock(state_file, fcntl.LOCK_EX)
+            try:
+                state_file.seek(0)
+                content = state_file.read()
+                for name, state in (json.loads(content) if content else {}).items():
+                    if name in self._buckets:
+                        self._buckets[name].level = state["level"]
+                        self._buckets[name].updated = state["updated"]
+                yield
+                state_file.seek(0)
+                state_file.truncate()
+                state_file.write(
+                    json.dumps(
+                        {
+                            name: {"level": bucket.level, "updated": bucket.updated}
+                            for name, bucket in self._buckets.items()
+                        }
+                    )
+                )
+                state_file.flush()
+            finally:
+                fcntl.flock(state_file, fcntl.LOCK_UN)
+
+
+_shared_limiter: Optional[RateLimiter] = None
+_shared_limiter_lock = threading.Lock()
+_shared_limiter_loaded = False
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """
+    Get the rate limiter shared by every runner in this process.
+
+    Created from environment variables on first use unless set_rate_limiter() was called.
+
+    Returns:
+        RateLimiter or None when no limit is configured
+    """
+    global _shared_limiter, _shared_limiter_loaded
+    with _shared_limiter_lock:
+        if not _shared_limiter_loaded:
+            _shared_limiter = RateLimiter.from_env()
+            _shared_limiter_loaded = True
+        return _shared_limiter
+
+
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> None:
+    """
+    Replace the rate limiter shared by every runner in this process.
+
+    Args:
+        limiter: Rate limiter to share, or None to disable rate limiting
+    """
+    global _shared_limiter, _shared_limiter_loaded
+    with _shared_limiter_lock:
+        _shared_limiter = limiter
+        _shared_limiter_loaded = True
@@ -1,23 +1,61 @@
+import asyncio
+import copy
+import csv
+import io
+import itertools
 import json
 import os
 import sys
+import threading
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
+from .blob_store import BLOBS_DIR_NAME, BlobStore
+from .outcomes import OutcomeCounters
+from .sinks import (
+    DURABILITY_POLICIES,
+    JSONL_FILE_NAME,
+    BackgroundSink,
+    FileSink,
+    JsonlSink,
+    ReportSink,
+    StdoutSink,
+    atomic_write,
+)
+from .sqlite_store import SQLITE_FILE_NAME, SqliteSink
 from .statistical_analysis import (
     StatisticalAnalysis,
     analyse_measure_from_test_sample,
 )
 
+if TYPE_CHECKING:
+    from .shards import Shard
+
+VALIDATION_SUMMARY_FILE_NAME = "validation_summary"
+
+_run_id_sequence = itertools.count()
+
 
 class Reporter:
     run_number: int = 0
+    timed_out: bool = False
     test_name: str
     folder_path: str
 
     @staticmethod
     def _create_unique_id_from_time() -> str:
-        return datetime.now().strftime("%m%d-%H_%M_%S")
+        """
+        Create a run id that no other reporter shares.
+
+        Combines the time to the microsecond, the pytest-xdist worker or process id,
+        and a per-process sequence number, so reporters created in the same
+        second, thread pool or set of CI workers never collide. Ids usually sort
+        by creation time, but the wall clock is not monotonic, so after a clock
+        step they may not.
+        """
+        worker = os.getenv("PYTEST_XDIST_WORKER") or f"p{os.getpid()}"
+        sequence = next(_run_id_sequence)
+        return f"{datetime.now().strftime('%m%d-%H_%M_%S_%f')}-{worker}-{sequence:06d}"
 
     def __init__(
         self,
@@ -25,43 +63,341 @@ class Reporter:
         output_dir: str,
         unique_id: str | None = None,
         metadata: Optional[Dict[str, Any]] = None,
+        output_format: Optional[str] = None,
+        sinks: Optional[List[ReportSink]] = None,
+        background: Optional[bool] = None,
+        blob_store: Optional[BlobStore] = None,
+        durability: Optional[str] = None,
+        compact: Optional[bool] = None,
+        outcome_counters: Optional[OutcomeCounters] = None,
     ) -> None:
+        """
+        Initialize the Reporter with the folder its runs are written to.
+
+        Args:
+            test_name: Name of the test, used as the folder name prefix
+            output_dir: Directory holding the test_runs folder
+            unique_id: Folder name suffix, defaults to CAT_AI_RUN_ID or the current time.
+                       Shards of one test run share a folder by sharing this id
+            metadata: Data written once to metadata.json
+            output_format: "json" for one file per run, "jsonl" for one
+                           append-only runs.jsonl file or "sqlite" for a
+                           cat_ai_results.sqlite database shared by all test runs,
+                           defaults to value from get_output_format() if None
+            sinks: Destinations of run records, defaults to the output_format
+                   file sink plus a stdout echo when CAT_AI_REPORT_STDOUT is set
+            background: Write records on a background thread so report() returns
+                        immediately, defaults to CAT_AI_REPORT_BACKGROUND.
+                        close() waits until every record is written
+            blob_store: Store large metadata values and responses once, compressed,
+                        and reference them by hash. Defaults to a shared
+                        test_runs/blobs store when CAT_AI_BLOB_STORE is set
+            durability: When run and metadata files are fsynced: "none", "batch"
+                        or "record", defaults to value from get_durability() if None.
+                        Files are always replaced atomically, whatever the policy
+            compact: Write run files and the stdout echo as compact JSON instead of
+                     indenting by 4, defaults to CAT_AI_REPORT_COMPACT
+            outcome_counters: Counters updated with the validations of every reported run,
+                              defaults to new counters of this reporter. close() writes
+                              their per-validation analyses to validation_summary.md
+                              and validation_summary.csv
+        """
         self.test_name = test_name
         self.metadata = metadata or {}
+        self.output_format = output_format or self.get_output_format()
+        if self.output_format not in ("json", "jsonl", "sqlite"):
+            raise ValueError(f"Unknown output format '{self.output_format}'")
+        self.durability = durability or self.get_durability()
+        if self.durability not in DURABILITY_POLICIES:
+            raise ValueError(f"Unknown durability policy '{self.durability}'")
+        self.compact = compact if compact is not None else _env_flag("CAT_AI_REPORT_COMPACT")
+        self._metadata_written = threading.Event()
+        self._outcome_lock = threading.Lock()
+        self._reported: Optional[bool] = None
+        self._summary_shard: Optional["Shard"] = None
+        self.outcome_counters = (
+            outcome_counters if outcome_counters is not None else OutcomeCounters()
+        )
 
-        if not unique_id:
-            unique_id = self._create_unique_id_from_time()
+        unique_id = unique_id or os.getenv("CAT_AI_RUN_ID")
+        if unique_id:
+            self.folder_path = os.path.join(output_dir, "test_runs", f"{test_name}-{unique_id}")
+            os.makedirs(self.folder_path, exist_ok=True)
+        else:
+            self.folder_path = self._create_unique_folder(output_dir, test_name)
+        if blob_store is None and _env_flag("CAT_AI_BLOB_STORE"):
+            blob_store = BlobStore(os.path.join(output_dir, "test_runs", BLOBS_DIR_NAME))
+        self.blob_store = blob_store
+        if sinks is None:
+            sinks = [self._default_sink()]
+            if _env_flag("CAT_AI_REPORT_STDOUT"):
+                sinks.append(StdoutSink(compact=self.compact))
+        if background if background is not None else _env_flag("CAT_AI_REPORT_BACKGROUND"):
+            sinks = [BackgroundSink(sink) for sink in sinks]
+        self.sinks = sinks
 
-        unique_dir_name = f"{test_name}-{unique_id}"
-        self.folder_path = os.path.join(output_dir, "test_runs", unique_dir_name)
-        os.makedirs(self.folder_path, exist_ok=True)
+    def _create_unique_folder(self, output_dir: str, test_name: str) -> str:
+        test_runs_dir = os.path.join(output_dir, "test_runs")
+        os.makedirs(test_runs_dir, exist_ok=True)
+        while True:
+            folder_path = os.path.join(
+                test_runs_dir, f"{test_name}-{self._create_unique_id_from_time()}"
+            )
+            try:
+                os.mkdir(folder_path)
+                return folder_path
+            except FileExistsError:
+                continue  # claimed by another process, try the next id
 
-    def report(self, response: str, results: Dict[str, bool]) -> bool:
-        metadata_path = os.path.join(self.folder_path, "metadata.json")
-        if not os.path.exists(metadata_path):
-            with open(metadata_path, "w") as file:
-                file.write(json.dumps(self.metadata, indent=4))
+    def __enter__(self) -> "Reporter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @staticmethod
+    def get_output_format(default_format: str = "json") -> str:
+        """
+        Get the run report format from environment variable or use default.
+
+        Args:
+            default_format: Default format if CAT_AI_REPORT_FORMAT is not set
+
+        Returns:
+            "json", "jsonl" or "sqlite"
+        """
+        return os.getenv("CAT_AI_REPORT_FORMAT", default_format)
+
+    @staticmethod
+    def get_durability(default_policy: str = "none") -> str:
+        """
+        Get the durability policy of report files from environment variable or use default.
+
+        Args:
+            default_policy: Default policy if CAT_AI_DURABILITY is not set
+
+        Returns:
+            "none" to leave syncing to the OS, "batch" to fsync groups of files
+            and on flush, or "record" to fsync every file as it is written
+        """
+        return os.getenv("CAT_AI_DURABILITY", default_policy)
+
+    def _default_sink(self) -> ReportSink:
+        if self.output_format == "jsonl":
+            return JsonlSink(
+                os.path.join(self.folder_path, JSONL_FILE_NAME), durability=self.durability
+            )
+        if self.output_format == "sqlite":
+            test_runs_dir = os.path.dirname(self.folder_path)
+            return SqliteSink(os.path.join(test_runs_dir, SQLITE_FILE_NAME))
+        return FileSink(self.folder_path, durability=self.durability, compact=self.compact)
+
+    def writes_run_folder(self) -> bool:
+        """
+        Check whether run reports can be read back from the reporter's folder.
+
+        Returns:
+            bool: True when a sink writes run files or runs.jsonl into folder_path,
+            as read_run_records() and resuming need
+        """
+        for sink in self.sinks:
+            if isinstance(sink, BackgroundSink):
+                sink = sink.sink
+            if isinstance(sink, FileSink) and sink.folder_path == self.folder_path:
+                return True
+            if isinstance(sink, JsonlSink) and os.path.dirname(sink.path) == self.folder_path:
+                return True
+        return False
+
+    def flush(self) -> None:
+        """Wait until every reported run is written by all sinks."""
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self) -> None:
+        """Write every reported run, close all sinks and write the validation summary."""
+        for sink in self.sinks:
+            sink.close()
+        self._write_validation_summary()
+
+    def write_validation_summary(self, shard: Optional["Shard"] = None) -> None:
+        """
+        Write every reported run and the validation summary of the runs reported so far.
+
+        The runners call this at the end of run_multiple, so the summary is
+        written in CI without closing the reporter. Later calls, and close(),
+        rewrite it with the runs reported since.
+
+        Args:
+            shard: Shard the runs belong to, which names the summary files of
+                   this shard. Defaults to the shard given earlier, then to
+                   Shard.from_env()
+        """
+        if shard is not None:
+            self._summary_shard = shard
+        self.flush()
+        self._write_validation_summary()
+
+    def for_run(self, run_number: int) -> "Reporter":
+        """
+        Create a reporter bound to a single run number.
+
+        The returned reporter shares the output folder and metadata with this one,
+        so concurrent runs can report without overwriting each other's run number.
 
+        Args:
+            run_number: Run index used to name the pass/fail report file
+
+        Returns:
+            Reporter: Shallow copy of this reporter with its own run number
+        """
+        run_reporter = copy.copy(self)
+        run_reporter.run_number = run_number
+        run_reporter._outcome_lock = threading.Lock()
+        run_reporter._reported = None
+        return run_reporter
+
+    def report(self, response: str, results: Dict[str, bool]) -> bool:
         final_result = all(results.values())
-        file_name = f"{'pass' if final_result else 'fail'}-{self.run_number}.json"
-        output_path = os.path.join(self.folder_path, file_name)
+        with self._outcome_lock:
+            if not self.timed_out:
+                self._write_run_report("pass" if final_result else "fail", response, results)
+                self._count(results)
+                self._reported = final_result
+        return final_result
+
+    def report_timeout(self, timeout: float) -> bool:
+        """
+        Record that the run did not finish within its deadline.
+
+        Writes a timeout-N.json report, and ignores any later report() call of
+        this run so a late finish cannot add a pass or fail file for it. A run
+        that reported right at its deadline keeps its pass or fail report.
+
+        Args:
+            timeout: Seconds the run was allowed to take
+
+        Returns:
+            bool: False, a timed out run counts as a failure, or the outcome
+            already reported by the run
+        """
+        with self._outcome_lock:
+            if self._reported is not None:
+                return self._reported
+            self.timed_out = True
+            results = {"finished_within_deadline": False}
+            self._write_run_report("timeout", f"No response within {timeout}s", results)
+            self._count(results)
+        return False
+
+    def abandon(self) -> None:
+        """
+        Ignore any later report() call of a run that is left out of the results.
+
+        Used for runs still in flight when the time budget is spent, so a late
+        finish cannot add a run file the returned results do not contain.
+        """
+        with self._outcome_lock:
+            self.timed_out = True
+
+    def _count(self, results: Dict[str, bool]) -> None:
+        self.outcome_counters.add_validations(results, self.run_number)
+
+    def validation_analyses(self) -> Dict[str, StatisticalAnalysis]:
+        """
+        Analyse the failures of every validation reported so far.
+
+        Returns:
+            Dict[str, StatisticalAnalysis]: Analysis by validation name, in the
+            order the validations were first reported
+        """
+        counters = self.outcome_counters
+        return {name: counters.analysis(name) for name in counters.validation_names}
 
+    def format_validation_summary(self) -> str:
+        """
+        Format the analysis of every validation as markdown, one format_summary() per name.
+
+        Returns:
+            str: Markdown headed by the test name, with a section per validation name
+        """
+        sections = [
+            f"### {name}\n\n{self.format_summary(analysis)}"
+            for name, analysis in self.validation_analyses().items()
+        ]
+        return "\n".join([f"## {self.test_name} validations\n", *sections])
+
+    def validation_summary_csv(self) -> str:
+        """
+        Format the analysis of every validation as CSV.
+
+        Returns:
+            str: A validation column followed by the StatisticalAnalysis CSV columns,
+            one row per validation name
+        """
+        output = io.StringIO()
+        writer = csv.writer(output, lineterminator="\n")
+        writer.writerow(["validation", *StatisticalAnalysis.get_csv_headers()])
+        for name, analysis in self.validation_analyses().items():
+            writer.writerow([name, *analysis.as_csv_row()])
+        return output.getvalue()
+
+    def _write_validation_summary(self) -> None:
+        if not self.outcome_counters.validation_names:
+            return
+        # Imported here because shards imports this module
+        from .shards import Shard
+
+        shard = self._summary_shard or Shard.from_env()
+        # Shards share the folder of a test run, each keeps its own summary
+        suffix = f"-shard-{shard.index}-of-{shard.count}" if shard else ""
+        path = os.path.join(self.folder_path, f"{VALIDATION_SUMMARY_FILE_NAME}{suffix}")
+        sync = self.durability != "none"
+        atomic_write(f"{path}.md", self.format_validation_summary(), sync=sync)
+        atomic_write(f"{path}.csv", self.validation_summary_csv(), sync=sync)
+
+    def _write_run_report(self, outcome: str, response: str, results: Dict[str, bool]) -> None:
+        metadata_path = os.path.join(self.folder_path, "metadata.json")
+        if not self._metadata_written.is_set():
+            self._write_metadata(metadata_path)
+
+        file_name = f"{outcome}-{self.run_number}.json"
         run_report = {
             "test_name": self.test_name,
             "folder_path": self.folder_path,
             "output_file": file_name,
             "metadata_path": metadata_path,
-            "validations": results,
-            "response": response,
+            "validations": dict(results),
+            "response": self.blob_store.externalize(response) if self.blob_store else response,
         }
 
-        json_object = json.dumps(run_report, indent=4)
-        print(json_object)
+        for sink in self.sinks:
+            sink.write(run_report)
+
+    def _write_metadata(self, metadata_path: str) -> None:
+        if not os.path.exists(metadata_path):
+            metadata = (
+                self.blob_store.externalize_values(self.metadata)
+                if self.blob_store
+                else self.metadata
+            )
+            atomic_write(
+                metadata_path, json.dumps(metadata, indent=4), sync=self.durability != "none"
+            )
+        self._metadata_written.set()
 
-        with open(output_path, "w") as file:
-            file.write(json_object)
+    async def areport(self, response: str, results: Dict[str, bool]) -> bool:
+        """
+        Report a run from a coroutine without blocking the event loop.
 
-        return final_result
+        Args:
+            response: Response produced by the run
+            results: Validation name to outcome mapping
+
+        Returns:
+            bool: True when all validations passed
+        """
+        return await asyncio.to_thread(self.report, response, results)
 
     @staticmethod
     def format_summary(to_report: StatisticalAnalysis) -> str:
@@ -74,6 +410,7 @@ class Reporter:
         Returns:
             str: Formatted string with the error margin calculations and confidence interval
         """
+        method = "" if to_report.method == "normal" else f" {to_report.method.title()}"
         output = "> [!NOTE]\n"
         output += (
             f"> ## {to_report.observation} ± {to_report.margin_of_error_count} "
@@ -81,7 +418,7 @@ class Reporter:
         )
         output += "> \n"
         output += (
-            "> **90% Confidence Range:** "
+            f"> **{to_report.confidence_level * 100:g}%{method} Confidence Range:** "
             f"{to_report.confidence_interval_count[0]}-"
             f"{to_report.confidence_interval_count[1]} failures\n"
         )
@@ -97,6 +434,10 @@ class Reporter:
         return output
 
 
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").lower() in ("1", "true", "yes")
+
+
 if __name__ == "__main__":
     if len(sys.argv) != 3:
         print("Usage: python reporter.py failure_count sample_size")
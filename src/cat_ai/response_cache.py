@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+CACHE_MODES = ("off", "record", "replay", "auto")
+_MISSING = object()
+
+
+class CacheMiss(KeyError):
+    """Raised in replay mode when no response was recorded for a run."""
+
+
+class ResponseCache:
+    """
+    Cassette of generated responses for offline re-validation.
+
+    Responses are stored per request, keyed by a hash of the model, messages and
+    parameters, and per run number, so a replayed run sees the response that was
+    recorded for the same run.
+
+    Modes:
+        off: always generate, never store
+        record: always generate and store the response
+        replay: only return stored responses, raise CacheMiss otherwise
+        auto: return stored responses, generate and store missing ones
+    """
+
+    def __init__(self, cache_dir: str, mode: Optional[str] = None) -> None:
+        """
+        Initialize the ResponseCache with a folder and a mode.
+
+        Args:
+            cache_dir: Folder holding one sub-folder per request
+            mode: One of CACHE_MODES, defaults to value from get_mode() if None
+        """
+        self.cache_dir = cache_dir
+        self.mode = mode or self.get_mode()
+        if self.mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode '{self.mode}', expected one of {CACHE_MODES}")
+
+    @staticmethod
+    def get_mode(default_mode: str = "record") -> str:
+        """
+        Get cache mode from environment variable or use default.
+
+        Args:
+            default_mode: Default mode if CAT_AI_CACHE_MODE is not set
+
+        Returns:
+            Cache mode
+        """
+        return os.getenv("CAT_AI_CACHE_MODE", default_mode)
+
+    @staticmethod
+    def request_key(request: Dict[str, Any]) -> str:
+        """
+        Hash a request description such as model, messages and parameters.
+
+        Args:
+            request: JSON serializable description of the generation request
+
+        Returns:
+            Hex digest identifying the request
+        """
+        canonical = json.dumps(request, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def fetch(self, request: Dict[str, Any], run_number: int, generate: Callable[[], Any]) -> Any:
+        """
+        Get the response of one run, generating it when the mode requires.
+
+        Args:
+            request: Description of the generation request
+            run_number: Run index the response belongs to
+            generate: Function producing a fresh response
+
+        Returns:
+            Stored or freshly generated response
+        """
+        return self.fetch_batch(request, [run_number], lambda _: [generate()])[0]
+
+    def fetch_batch(
+        self,
+        request: Dict[str, Any],
+        run_numbers: Sequence[int],
+        generate: Callable[[int], Sequence[Any]],
+    ) -> List[Any]:
+        """
+        Get the responses of several runs produced by one batch request.
+
+        Stored responses are only used when every run of the batch has one,
+        otherwise the whole batch is generated again.
+
+        Args:
+            request: Description of the generation request
+            run_numbers: Run indexes the responses belong to
+            generate: Function producing the given number of fresh responses
+
+        Returns:
+            Stored or freshly generated responses, ordered like run_numbers
+        """
+        folder = os.path.join(self.cache_dir, self.request_key(request))
+        if self.mode in ("replay", "auto"):
+            stored = [self._load(folder, run_number) for run_number in run_numbers]
+            if _MISSING not in stored:
+                return stored
+            if self.mode == "replay":
+                missing = [
+                    n
+                    for n, response in zip(run_numbers, stored, strict=True)
+                    if response is _MISSING
+                ]
+                raise CacheMiss(f"No recorded responses for runs {missing} in {folder}")
+
+        responses = list(generate(len(run_numbers)))
+        if self.mode != "off":
+            self._store(folder, request, run_numbers, responses)
+        return responses
+
+    @staticmethod
+    def _load(folder: str, run_number: int) -> Any:
+        try:
+            with open(os.path.join(folder, f"{run_number}.json")) as file:
+                return json.load(file)["response"]
+        except FileNotFoundError:
+            return _MISSING
+
+    @staticmethod
+    def _store(
+        folder: str, request: Dict[str, Any], run_numbers: Sequence[int], responses: List[Any]
+    ) -> None:
+        os.makedirs(folder, exist_ok=True)
+        request_path = os.path.join(folder, "request.json")
+        if not os.path.exists(request_path):
+            _write_json(request_path, request)
+        for run_number, response in zip(run_numbers, responses, strict=False):
+            _write_json(os.path.join(folder, f"{run_number}.json"), {"response": response})
+
+
+def _write_json(path: str, content: Any) -> None:
+    temp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    with open(temp_path, "w") as file:
+        json.dump(content, file, default=str)
+    os.replace(temp_path, path)
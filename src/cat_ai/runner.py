@@ -1,22 +1,65 @@
+import logging
 import os
-from typing import Callable, List, Optional
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from .reporter import Reporter
+from .outcomes import OutcomeCounters
+from .rate_limiter import RateLimiter, get_rate_limiter
+from .reporter import Reporter, _env_flag
+from .shards import Shard, collect_run_outcomes
+from .sinks import read_run_records, run_outcome
+from .statistical_analysis import SampleAccumulator, required_sample_size, sequential_decision
+
+logger = logging.getLogger(__name__)
 
 
 class Runner:
     """Executes test functions and collects results using a reporter."""
 
-    def __init__(self, test_function: Callable[[Reporter], bool], reporter: Reporter) -> None:
+    def __init__(
+        self,
+        test_function: Callable[[Reporter], bool],
+        reporter: Reporter,
+        max_workers: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        tokens_per_run: int = 0,
+        timeout: Optional[float] = None,
+        time_budget: Optional[float] = None,
+        shard: Optional[Shard] = None,
+        resume: Optional[bool] = None,
+    ) -> None:
         """
         Initialize the Runner with a test function and reporter.
 
         Args:
             test_function: Function to execute during test runs
             reporter: Reporter instance to track and report test results
+            max_workers: Number of runs to execute concurrently, defaults to
+                         value from get_concurrency() if None
+            rate_limiter: Budget to acquire before every run, defaults to the
+                          process-wide limiter from get_rate_limiter()
+            tokens_per_run: Estimated tokens one run spends on generation
+            timeout: Seconds a single run may take before it is recorded as a
+                     timeout, defaults to value from get_timeout() if None
+            time_budget: Seconds run_multiple may spend in total before it stops
+                         starting runs, defaults to value from get_time_budget() if None
+            shard: Slice of run numbers run_multiple executes, defaults to
+                   value from Shard.from_env() if None
+            resume: Skip the runs already reported into the reporter's folder,
+                    defaults to value from get_resume() if None
         """
         self.reporter = reporter
         self.test_function = test_function
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter
+        self.tokens_per_run = tokens_per_run
+        self.timeout = timeout if timeout is not None else self.get_timeout()
+        self.time_budget = time_budget if time_budget is not None else self.get_time_budget()
+        self.shard = shard or Shard.from_env()
+        self.resume = resume if resume is not None else self.get_resume()
 
     @staticmethod
     def get_sample_size(default_size: int = 1) -> int:
@@ -31,6 +74,109 @@ class Runner:
         """
         return int(os.getenv("CAT_AI_SAMPLE_SIZE", str(default_size)))
 
+    @staticmethod
+    def plan_sample_size(
+        expected_success_rate: float,
+        margin_of_error: float,
+        confidence_level: Optional[float] = None,
+    ) -> int:
+        """
+        Get the sample size needed for the precision a test claims.
+
+        The planned size is used as the default of get_sample_size(), so
+        CAT_AI_SAMPLE_SIZE still overrides it in CI.
+
+        Args:
+            expected_success_rate: Success rate the test is expected to reach
+            margin_of_error: Largest acceptable distance from the true success rate
+            confidence_level: Confidence that the true rate lies within the margin,
+                              defaults to value from get_confidence_level() if None
+
+        Returns:
+            Number of test runs to perform
+        """
+        planned_size = required_sample_size(
+            expected_success_rate, margin_of_error, confidence_level
+        )
+        return Runner.get_sample_size(default_size=planned_size)
+
+    @staticmethod
+    def get_concurrency(default_workers: int = 1) -> int:
+        """
+        Get the number of concurrent runs from environment variable or use default.
+
+        Args:
+            default_workers: Default number of workers if not specified in environment
+
+        Returns:
+            Number of test runs to execute at the same time
+        """
+        return int(os.getenv("CAT_AI_CONCURRENCY", str(default_workers)))
+
+    @staticmethod
+    def get_timeout() -> Optional[float]:
+        """
+        Get the per-run timeout from environment variable.
+
+        Returns:
+            Seconds a single run may take, None when CAT_AI_RUN_TIMEOUT is not set
+        """
+        timeout = os.getenv("CAT_AI_RUN_TIMEOUT")
+        return float(timeout) if timeout else None
+
+    @staticmethod
+    def get_time_budget() -> Optional[float]:
+        """
+        Get the total time budget of run_multiple from environment variable.
+
+        Returns:
+            Seconds all runs may take together, None when CAT_AI_TIME_BUDGET is not set
+        """
+        time_budget = os.getenv("CAT_AI_TIME_BUDGET")
+        return float(time_budget) if time_budget else None
+
+    @staticmethod
+    def get_resume() -> bool:
+        """
+        Get whether run_multiple resumes an interrupted test run from environment variable.
+
+        Returns:
+            True when CAT_AI_RESUME is set to 1, true or yes
+        """
+        return _env_flag("CAT_AI_RESUME")
+
+    def completed_runs(self) -> Dict[int, bool]:
+        """
+        Get the outcomes of the runs already reported into the reporter's folder.
+
+        Only run files and runs.jsonl are read back, so a reporter writing only
+        to SQLite, an object store or another sink raises ValueError instead of
+        silently executing, and paying for, every run again.
+
+        Returns:
+            Dict mapping run number to whether the run passed
+        """
+        if not self.reporter.writes_run_folder():
+            raise ValueError(
+                "Resuming reads the run files or runs.jsonl of the reporter's folder, "
+                f"but no sink of the reporter writes them into {self.reporter.folder_path}"
+            )
+        return collect_run_outcomes(self.reporter.folder_path)
+
+    def _restore_completed_runs(self, run_numbers: Iterable[int]) -> Dict[int, bool]:
+        completed = self.completed_runs()
+        outcomes = {n: completed[n] for n in run_numbers if n in completed}
+        # The validation summary written after this session covers the resumed runs too
+        counted = set()
+        for record in read_run_records(self.reporter.folder_path):
+            outcome = run_outcome(record)
+            if outcome and outcome[0] in outcomes and outcome[0] not in counted:
+                counted.add(outcome[0])
+                self.reporter.outcome_counters.add_validations(
+                    record.get("validations", {}), outcome[0]
+                )
+        return outcomes
+
     def run_once(self, run_number: int = 0) -> bool:
         """
         Execute the test function once.
@@ -41,19 +187,269 @@ class Runner:
         Returns:
             Result from the test function
         """
-        self.reporter.run_number = run_number
-        return self.test_function(self.reporter)
+        return self._run_with(self.reporter.for_run(run_number))
+
+    def _run_with(self, run_reporter: Reporter) -> bool:
+        self._acquire_budget()
+        return self.test_function(run_reporter)
+
+    def _acquire_budget(self) -> None:
+        rate_limiter = self.rate_limiter or get_rate_limiter()
+        if rate_limiter:
+            rate_limiter.acquire(self.tokens_per_run)
 
-    def run_multiple(self, sample_size: Optional[int] = None) -> List[bool]:
+    def run_multiple(
+        self, sample_size: Optional[int] = None, max_workers: Optional[int] = None
+    ) -> List[bool]:
         """
         Execute the test function multiple times based on sample size.
 
+        The reporter's validation summary is written once the runs finish.
+
+        Runs are spread over a bounded thread pool when more than one worker is
+        configured, which suits test functions that mostly wait on LLM calls.
+        A run that exceeds the timeout is recorded as a timeout failure. Once the
+        time budget is spent no new runs start, and runs still in flight are
+        left out of the results. With a shard only its slice of the run numbers
+        is executed; merge_shard_results() combines the shards afterwards.
+        When resuming, runs already reported into the reporter's folder, for
+        example by a CI job that was cancelled, are not executed again and
+        their recorded outcomes are part of the results.
+
+        Args:
+            sample_size: Number of times to run the test, defaults to
+                         value from get_sample_size() if None
+            max_workers: Number of runs to execute concurrently, overrides the
+                         value given to the constructor
+
+        Returns:
+            List of results from all finished test runs, ordered by run number
+        """
+        runs = sample_size if sample_size is not None else self.get_sample_size()
+        run_numbers = self.shard.run_numbers(runs) if self.shard else range(runs)
+        workers = max_workers or self.max_workers or self.get_concurrency()
+        if self.resume:
+            outcomes = self._restore_completed_runs(run_numbers)
+            missing = [n for n in run_numbers if n not in outcomes]
+            logger.info(
+                f"Resuming with {len(outcomes)} of {len(run_numbers)} runs already reported"
+            )
+            outcomes.update(self._run_outcomes(missing, workers, self._budget_deadline()))
+        else:
+            outcomes = self._run_outcomes(run_numbers, workers, self._budget_deadline())
+        self.reporter.write_validation_summary(self.shard)
+        return [outcomes[run_number] for run_number in sorted(outcomes)]
+
+    def run_counted(
+        self,
+        sample_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        counters: Optional[OutcomeCounters] = None,
+        chunk_size: int = 1024,
+    ) -> OutcomeCounters:
+        """
+        Execute the test function like run_multiple, counting outcomes instead of listing them.
+
+        Runs are executed in chunks and only their counts are kept, so memory
+        stays bounded for very large sample sizes of cheap runs, such as
+        replayed responses. When resuming, runs already reported into the
+        reporter's folder are counted without being executed again.
+
         Args:
             sample_size: Number of times to run the test, defaults to
                          value from get_sample_size() if None
+            max_workers: Number of runs to execute concurrently, overrides the
+                         value given to the constructor
+            counters: Counters to add the outcomes to, for example one keeping the
+                      history of every run, defaults to new OutcomeCounters.
+                      They must not be the reporter's outcome_counters, which
+                      already count every reported run
+            chunk_size: Runs executed before their outcomes are counted
 
         Returns:
-            List of results from all test runs
+            OutcomeCounters: Counts of all finished test runs
         """
+        if counters is not None and counters is self.reporter.outcome_counters:
+            raise ValueError(
+                "The reporter's outcome_counters already count every reported run, "
+                "pass other counters to run_counted"
+            )
         runs = sample_size if sample_size is not None else self.get_sample_size()
-        return [self.run_once(i) for i in range(runs)]
+        run_numbers: Sequence[int] = self.shard.run_numbers(runs) if self.shard else range(runs)
+        workers = max_workers or self.max_workers or self.get_concurrency()
+        counters = counters if counters is not None else OutcomeCounters()
+        if self.resume:
+            completed = self._restore_completed_runs(run_numbers)
+            for run_number, passed in sorted(completed.items()):
+                counters.add(passed, run_number)
+            run_numbers = [n for n in run_numbers if n not in completed]
+
+        deadline = self._budget_deadline()
+        for start in range(0, len(run_numbers), max(chunk_size, 1)):
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            chunk = run_numbers[start : start + chunk_size]
+            for run_number, passed in self._run_outcomes(chunk, workers, deadline).items():
+                counters.add(passed, run_number)
+        self.reporter.write_validation_summary(self.shard)
+        return counters
+
+    def run_sequential(
+        self,
+        expected_success_rate: float,
+        max_sample_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        tolerance: float = 0.05,
+    ) -> List[bool]:
+        """
+        Execute the test function in batches until pass or fail is statistically settled.
+
+        After each batch the results so far are checked with sequential_decision(),
+        and no more runs are started once the success rate is clearly above or
+        below the expected success rate. A shard cannot decide on its own
+        whether the whole sample is settled, so sharded runners raise ValueError.
+
+        Args:
+            expected_success_rate: Success rate the test is expected to reach
+            max_sample_size: Upper bound on the number of runs, defaults to
+                             value from get_sample_size() if None
+            batch_size: Number of runs between checks, defaults to the
+                        number of concurrent workers
+            tolerance: Distance from the expected success rate that is
+                       treated as a clear pass or fail
+
+        Returns:
+            List of results from the executed test runs, ordered by run number
+        """
+        if self.shard:
+            raise ValueError(
+                f"run_sequential cannot run shard {self.shard.index}/{self.shard.count}, "
+                "use run_multiple and merge_shard_results() instead"
+            )
+        runs = max_sample_size if max_sample_size is not None else self.get_sample_size()
+        workers = self.max_workers or self.get_concurrency()
+        step = max(batch_size or workers, 1)
+
+        deadline = self._budget_deadline()
+        results: List[bool] = []
+        accumulator = SampleAccumulator()
+        next_run = 0
+        while next_run < runs and (deadline is None or time.monotonic() < deadline):
+            batch = range(next_run, min(next_run + step, runs))
+            next_run = batch.stop
+            batch_results = self._run_numbers(batch, workers, deadline)
+            results.extend(batch_results)
+            accumulator += SampleAccumulator.from_outcomes(batch_results)
+            decision = sequential_decision(
+                accumulator.success_count, accumulator.sample_size, expected_success_rate, tolerance
+            )
+            if decision is not None:
+                logger.info(
+                    f"Stopped after {len(results)} of {runs} runs: "
+                    f"{'pass' if decision else 'fail'} is settled"
+                )
+                break
+        self.reporter.write_validation_summary(self.shard)
+        return results
+
+    def _budget_deadline(self) -> Optional[float]:
+        return None if self.time_budget is None else time.monotonic() + self.time_budget
+
+    def _run_numbers(
+        self, run_numbers: Iterable[int], workers: int, deadline: Optional[float] = None
+    ) -> List[bool]:
+        outcomes = self._run_outcomes(run_numbers, workers, deadline)
+        return [outcomes[run_number] for run_number in sorted(outcomes)]
+
+    def _run_outcomes(
+        self, run_numbers: Iterable[int], workers: int, deadline: Optional[float] = None
+    ) -> Dict[int, bool]:
+        numbers = list(run_numbers)
+        if self.timeout is not None or deadline is not None:
+            return self._run_with_deadlines(numbers, max(workers, 1), deadline)
+        if workers <= 1 or len(numbers) <= 1:
+            return {i: self.run_once(i) for i in numbers}
+
+        with ThreadPoolExecutor(max_workers=min(workers, len(numbers))) as executor:
+            return dict(zip(numbers, executor.map(self.run_once, numbers), strict=True))
+
+    def _run_with_deadlines(
+        self, numbers: List[int], workers: int, deadline: Optional[float]
+    ) -> Dict[int, bool]:
+        # Runs get their own daemon threads: a hung LLM call cannot be interrupted,
+        # so it is abandoned instead of holding up a pool worker or interpreter exit.
+        # A run's timeout starts once it has its rate limit budget, which the
+        # second future of each run resolves to the start time of.
+        pending = deque(numbers)
+        active: Dict[Future, Tuple[Reporter, Future]] = {}
+        results: Dict[int, bool] = {}
+
+        while pending or active:
+            while (
+                pending
+                and len(active) < workers
+                and (deadline is None or time.monotonic() < deadline)
+            ):
+                run_reporter = self.reporter.for_run(pending.popleft())
+                future, started = self._start_thread(run_reporter)
+                active[future] = (run_reporter, started)
+            if not active:
+                break
+
+            now = time.monotonic()
+            starting = [started for _, started in active.values() if not started.done()]
+            wake_ups = [
+                started.result() + self.timeout
+                for _, started in active.values()
+                if self.timeout and started.done()
+            ]
+            if deadline is not None:
+                wake_ups.append(deadline)
+            wait(
+                [*active, *starting],
+                timeout=max(min(wake_ups) - now, 0) if wake_ups else None,
+                return_when=FIRST_COMPLETED,
+            )
+
+            now = time.monotonic()
+            for future, (run_reporter, started) in list(active.items()):
+                if future.done():
+                    results[run_reporter.run_number] = future.result()
+                elif (
+                    self.timeout is not None
+                    and started.done()
+                    and now >= started.result() + self.timeout
+                ):
+                    logger.warning(f"Run {run_reporter.run_number} timed out after {self.timeout}s")
+                    results[run_reporter.run_number] = run_reporter.report_timeout(self.timeout)
+                else:
+                    continue
+                del active[future]
+
+            if deadline is not None and now >= deadline:
+                if pending or active:
+                    logger.warning(
+                        f"Time budget of {self.time_budget}s spent, "
+                        f"skipping {len(pending)} runs and abandoning {len(active)} in flight"
+                    )
+                for run_reporter, _ in active.values():
+                    run_reporter.abandon()
+                break
+        return results
+
+    def _start_thread(self, run_reporter: Reporter) -> Tuple[Future, Future]:
+        future: Future = Future()
+        started: Future = Future()
+
+        def target() -> None:
+            try:
+                self._acquire_budget()
+                started.set_result(time.monotonic())
+                future.set_result(self.test_function(run_reporter))
+            except BaseException as error:
+                if not started.done():
+                    started.set_result(time.monotonic())
+                future.set_exception(error)
+
+        threading.Thread(target=target, daemon=True).start()
+        return future, started
@@ -0,0 +1,115 @@
+import os
+import sys
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from .reporter import Reporter
+from .sinks import read_run_records, run_outcome
+from .statistical_analysis import SampleAccumulator, StatisticalAnalysis
+
+
+@dataclass(frozen=True)
+class Shard:
+    """Slice of run numbers executed by one CI node or pytest-xdist worker."""
+
+    index: int
+    count: int
+
+    def __post_init__(self) -> None:
+        if not 1 <= self.index <= self.count:
+            raise ValueError(f"Shard index must be between 1 and {self.count}, got {self.index}")
+
+    @classmethod
+    def parse(cls, spec: str) -> "Shard":
+        """
+        Parse a shard specification such as "2/8".
+
+        Args:
+            spec: One-based shard index and shard count separated by a slash
+
+        Returns:
+            Shard: Parsed shard
+        """
+        index, _, count = spec.partition("/")
+        return cls(index=int(index), count=int(count))
+
+    @classmethod
+    def from_env(cls) -> Optional["Shard"]:
+        """
+        Get the shard of this process from the CAT_AI_SHARD environment variable.
+
+        CAT_AI_SHARD=xdist takes the shard from the pytest-xdist worker id and
+        worker count, which suits running every test on every worker with
+        `pytest -n 8 --dist each`.
+
+        Returns:
+            Shard or None when no sharding is configured
+        """
+        spec = os.getenv("CAT_AI_SHARD")
+        if not spec:
+            return None
+        if spec == "xdist":
+            worker = os.getenv("PYTEST_XDIST_WORKER")
+            if not worker:
+                return None
+            worker_count = int(os.getenv("PYTEST_XDIST_WORKER_COUNT", "1"))
+            return cls(index=int(worker.removeprefix("gw")) + 1, count=worker_count)
+        return cls.parse(spec)
+
+    def run_numbers(self, sample_size: int) -> range:
+        """
+        Get the run numbers this shard executes.
+
+        Args:
+            sample_size: Total number of runs across all shards
+
+        Returns:
+            Every count-th run number, starting at this shard's offset
+        """
+        return range(self.index - 1, sample_size, self.count)
+
+
+def collect_run_outcomes(*folder_paths: str) -> Dict[int, bool]:
+    """
+    Collect the outcome of every run reported into the given folders.
+
+    A run number reported more than once counts as passed only if all its reports passed.
+
+    Args:
+        folder_paths: Test run folders written by one or more shards
+
+    Returns:
+        Dict mapping run number to whether the run passed
+    """
+    outcomes: Dict[int, bool] = {}
+    for folder_path in folder_paths:
+        for record in read_run_records(folder_path):
+            outcome = run_outcome(record)
+            if outcome:
+                run_number, passed = outcome
+                outcomes[run_number] = outcomes.get(run_number, True) and passed
+    return outcomes
+
+
+def merge_shard_results(*folder_paths: str) -> StatisticalAnalysis:
+    """
+    Analyse the failures of all shards of a test run together.
+
+    Args:
+        folder_paths: Test run folders written by one or more shards
+
+    Returns:
+        StatisticalAnalysis: Failure analysis over every reported run
+    """
+    outcomes = collect_run_outcomes(*folder_paths)
+    if not outcomes:
+        raise ValueError(f"No run reports found in {', '.join(folder_paths)}")
+    return SampleAccumulator.from_outcomes(outcomes.values()).analysis()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python -m cat_ai.shards test_run_folder [test_run_folder ...]")
+        sys.exit(1)
+
+    print(Reporter.format_summary(merge_shard_results(*sys.argv[1:])))
@@ -0,0 +1,459 @@
+import atexit
+import importlib
+import json
+import os
+import queue
+import re
+import sys
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO
+
+from .blob_store import BLOBS_DIR_NAME, BlobStore, contains_blob_refs
+
+RUN_FILE_PATTERN = re.compile(r"^(pass|fail|timeout)-(\d+)\.json$")
+JSONL_FILE_NAME = "runs.jsonl"
+DURABILITY_POLICIES = ("none", "batch", "record")
+PARTIAL_FILE_SUFFIX = ".partial"
+
+
+class ReportSink(ABC):
+    """Destination for run records written by a Reporter."""
+
+    @abstractmethod
+    def write(self, record: Dict[str, Any]) -> None:
+        """Write one run record."""
+
+    def flush(self) -> None:  # noqa: B027 - optional, sinks that buffer override it
+        """Make every written record durable."""
+
+    def close(self) -> None:
+        """Flush and release resources."""
+        self.flush()
+
+
+def _load_fast_dumps() -> Optional[Callable[[Any], bytes]]:
+    try:
+        fast_dumps: Callable[[Any], bytes] = importlib.import_module("orjson").dumps
+    except ImportError:
+        return None
+    return fast_dumps
+
+
+_installed_fast_dumps = _load_fast_dumps()
+_fast_dumps = _installed_fast_dumps
+
+
+def use_fast_encoder(enabled: bool = True) -> str:
+    """
+    Choose whether compact records are encoded with orjson when it is installed.
+
+    Args:
+        enabled: Use orjson if installed, or always use the standard json module
+
+    Returns:
+        str: Name of the compact encoder now in use, as returned by compact_encoder()
+    """
+    global _fast_dumps
+    _fast_dumps = _installed_fast_dumps if enabled else None
+    return compact_encoder()
+
+
+def compact_encoder() -> str:
+    """Get the name of the encoder of compact records: "orjson" or "json"."""
+    return "orjson" if _fast_dumps is not None else "json"
+
+
+def dumps_record(record: Dict[str, Any], compact: bool = False) -> str:
+    """
+    Serialize a run record to JSON text.
+
+    Compact records have no indentation or spaces between separators, and are
+    encoded with orjson when it is installed.
+
+    Args:
+        record: Run record written by a Reporter
+        compact: Write one line with minimal separators instead of indenting by 4
+
+    Returns:
+        str: JSON text of the record
+    """
+    if not compact:
+        return json.dumps(record, indent=4)
+    if _fast_dumps is not None:
+        try:
+            return _fast_dumps(record).decode("utf-8")
+        except TypeError:
+            pass  # a value orjson cannot encode, such as a very large int
+    return json.dumps(record, separators=(",", ":"), ensure_ascii=False)
+
+
+class FileSink(ReportSink):
+    """
+    One JSON file per run, named after the record's output_file.
+
+    Every file is written to a temporary file and renamed into place, so a
+    killed process never leaves a truncated run file behind. The durability
+    policy decides when files are also fsynced to survive a machine crash.
+    """
+
+    def __init__(
+        self,
+        folder_path: str,
+        durability: str = "none",
+        batch_size: int = 100,
+        compact: bool = False,
+    ) -> None:
+        """
+        Initialize the FileSink with the folder run files are written to.
+
+        Args:
+            folder_path: Test run folder
+            durability: "none" leaves syncing to the OS, "batch" fsyncs every
+                        batch_size files and on flush, "record" fsyncs every file
+            batch_size: Files written between fsyncs of the "batch" policy
+            compact: Write compact JSON instead of indenting by 4
+        """
+        self.folder_path = folder_path
+        self.durability = _check_durability(durability)
+        self.batch_size = batch_size
+        self.compact = compact
+        self._lock = threading.Lock()
+        self._unsynced: List[str] = []
+
+    def write(self, record: Dict[str, Any]) -> None:
+        path = os.path.join(self.folder_path, record["output_file"])
+        atomic_write(path, dumps_record(record, self.compact), sync=self.durability == "record")
+        if self.durability == "batch":
+            with self._lock:
+                self._unsynced.append(path)
+                if len(self._unsynced) >= self.batch_size:
+                    self._sync()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._sync()
+
+    def _sync(self) -> None:
+        if not self._unsynced:
+            return
+        for path in self._unsynced:
+            with open(path, "rb") as file:
+                os.fsync(file.fileno())
+        _fsync_directory(self.folder_path)
+        self._unsynced.clear()
+
+
+class StdoutSink(ReportSink):
+    """Echo of every run record to a text stream, pretty-printed unless compact."""
+
+    def __init__(self, stream: Optional[TextIO] = None, compact: bool = False) -> None:
+        self.stream = stream
+        self.compact = compact
+
+    def write(self, record: Dict[str, Any]) -> None:
+        print(dumps_record(record, self.compact), file=self.stream or sys.stdout)
+
+
+class JsonlSink(ReportSink):
+    """Append-only file holding one compact JSON run record per line."""
+
+    def __init__(
+        self,
+        path: str,
+        buffer_size: int = 1024 * 1024,
+        durability: str = "none",
+        batch_size: int = 100,
+    ) -> None:
+        """
+        Initialize the JsonlSink with the file records are appended to.
+
+        Args:
+            path: JSONL file, created if missing
+            buffer_size: Bytes buffered in memory before they are written
+            durability: "none" leaves syncing to the OS, "batch" fsyncs every
+                        batch_size records and on flush, "record" fsyncs every record
+            batch_size: Records written between fsyncs of the "batch" policy
+        """
+        self.path = path
+        self.durability = _check_durability(durability)
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        if os.path.exists(path):
+            # a record cut off by an interrupted run would swallow the first appended one
+            _truncate_partial_line(path)
+        self._file = open(path, "a", buffering=buffer_size, encoding="utf-8")
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = dumps_record(record, compact=True) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._unsynced += 1
+            if self.durability == "record" or (
+                self.durability == "batch" and self._unsynced >= self.batch_size
+            ):
+                self._sync()
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+                if self.durability != "none" and self._unsynced:
+                    self._sync()
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+
+class ObjectStoreSink(ReportSink):
+    """
+    One JSON object per run in an object store such as S3 or MinIO.
+
+    The store client is wrapped in a put function, which keeps cat_ai free of
+    client dependencies, for example
+    `ObjectStoreSink(lambda key, body: s3.put_object(Bucket=bucket, Key=key, Body=body), prefix)`.
+    """
+
+    def __init__(self, put: Callable[[str, bytes], Any], prefix: str = "") -> None:
+        self.put = put
+        self.prefix = prefix
+
+    def write(self, record: Dict[str, Any]) -> None:
+        key = f"{self.prefix}{os.path.basename(record['folder_path'])}/{record['output_file']}"
+        self.put(key, dumps_record(record, compact=True).encode("utf-8"))
+
+
+class BackgroundSink(ReportSink):
+    """
+    Hands run records to a writer thread through a bounded queue.
+
+    write() returns as soon as the record is queued and only blocks while the
+    queue is full. flush() and close() wait until every queued record is written
+    and re-raise the first error of the writer thread.
+    """
+
+    _STOP = object()
+
+    def __init__(self, sink: ReportSink, max_queue_size: int = 1000) -> None:
+        """
+        Initialize the BackgroundSink around the sink that does the writing.
+
+        Args:
+            sink: Sink written to from the background thread
+            max_queue_size: Records held in memory before write() blocks
+        """
+        self.sink = sink
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._raise_error()
+        self._queue.put(record)
+
+    def flush(self) -> None:
+        self._queue.join()
+        self.sink.flush()
+        self._raise_error()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        self._thread.join()
+        atexit.unregister(self.close)
+        self.sink.close()
+        self._raise_error()
+
+    def _drain(self) -> None:
+        while True:
+            record = self._queue.get()
+            try:
+                if record is self._STOP:
+                    return
+                if self._error is None:
+                    self.sink.write(record)
+            except BaseException as error:
+                self._error = error
+            finally:
+                self._queue.task_done()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+
+def atomic_write(path: str, content: str, sync: bool = False) -> None:
+    """
+    Replace a file with new content so readers see the old or the new file, never a mix.
+
+    Args:
+        path: File to write
+        content: Text written to the file
+        sync: Fsync the file and its folder, so the write also survives a machine crash
+    """
+    temp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        file.write(content)
+        if sync:
+            file.flush()
+            os.fsync(file.fileno())
+    os.replace(temp_path, path)
+    if sync:
+        _fsync_directory(os.path.dirname(path))
+
+
+def recover_run_folder(folder_path: str) -> List[str]:
+    """
+    Clean up the files an interrupted run left in a test run folder.
+
+    Removes leftover temporary files, renames run files that do not hold valid
+    JSON to <name>.partial, so their runs count as not done, and truncates a
+    partial last line of every JSONL file. Only call it while no reporter
+    writes to the folder.
+
+    Args:
+        folder_path: Test run folder written by a Reporter
+
+    Returns:
+        Paths of the files that were removed, renamed or truncated
+    """
+    recovered = []
+    for file_name in sorted(os.listdir(folder_path)):
+        path = os.path.join(folder_path, file_name)
+        if file_name.endswith(".tmp"):
+            os.remove(path)
+        elif RUN_FILE_PATTERN.match(file_name):
+            if _load_run_file(path) is not None:
+                continue
+            os.replace(path, path + PARTIAL_FILE_SUFFIX)
+        elif not (file_name.endswith(".jsonl") and _truncate_partial_line(path)):
+            continue
+        recovered.append(path)
+    return recovered
+
+
+def read_run_records(folder_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read the run records of a test run folder in either layout.
+
+    Yields the records of pass-N.json, fail-N.json and timeout-N.json files in
+    run number order, then the records of every JSONL file in the folder.
+    Partially written run files and a truncated last line of a JSONL file are
+    skipped, and responses kept in the test_runs/blobs store are loaded back
+    into the records.
+
+    Args:
+        folder_path: Test run folder written by a Reporter
+
+    Returns:
+        Iterator over run records
+    """
+    records = _read_raw_run_records(folder_path)
+    blob_store = BlobStore(os.path.join(os.path.dirname(folder_path), BLOBS_DIR_NAME))
+    for record in records:
+        yield blob_store.resolve(record) if contains_blob_refs(record) else record
+
+
+def _read_raw_run_records(folder_path: str) -> Iterator[Dict[str, Any]]:
+    file_names = sorted(os.listdir(folder_path))
+    run_files = sorted(
+        (int(match.group(2)), file_name)
+        for file_name in file_names
+        if (match := RUN_FILE_PATTERN.match(file_name))
+    )
+    for _, file_name in run_files:
+        record = _load_run_file(os.path.join(folder_path, file_name))
+        if record is not None:
+            yield record
+
+    for file_name in file_names:
+        if file_name.endswith(".jsonl"):
+            yield from _read_jsonl(os.path.join(folder_path, file_name))
+
+
+def run_outcome(record: Dict[str, Any]) -> Optional[tuple[int, bool]]:
+    """
+    Get the run number and pass/fail outcome of a run record.
+
+    Args:
+        record: Run record written by a Reporter
+
+    Returns:
+        Run number and whether the run passed, None for records of unknown shape
+    """
+    match = RUN_FILE_PATTERN.match(str(record.get("output_file", "")))
+    if not match:
+        return None
+    return int(match.group(2)), match.group(1) == "pass"
+
+
+def _load_run_file(path: str) -> Optional[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as file:
+        try:
+            record: Dict[str, Any] = json.load(file)
+            return record
+        except json.JSONDecodeError:
+            return None  # written by a process that was killed before it finished
+
+
+def _truncate_partial_line(path: str, chunk_size: int = 64 * 1024) -> bool:
+    # Scans back from the end only, so large files are not read into memory
+    with open(path, "rb+") as file:
+        end = file.seek(0, os.SEEK_END)
+        if not end:
+            return False
+        file.seek(end - 1)
+        if file.read(1) == b"\n":
+            return False
+        position = end
+        while position > 0:
+            start = max(position - chunk_size, 0)
+            file.seek(start)
+            newline = file.read(position - start).rfind(b"\n")
+            if newline >= 0:
+                file.truncate(start + newline + 1)
+                return True
+            position = start
+        file.truncate(0)
+    return True
+
+
+def _check_durability(durability: str) -> str:
+    if durability not in DURABILITY_POLICIES:
+        raise ValueError(f"Unknown durability policy '{durability}'")
+    return durability
+
+
+def _fsync_directory(folder_path: str) -> None:
+    if os.name == "nt":
+        return  # directories cannot be opened for fsync on Windows
+    descriptor = os.open(folder_path, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def _read_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                if line.endswith("\n"):
+                    raise
+                return  # partial last line of an interrupted run
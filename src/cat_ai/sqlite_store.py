@@ -0,0 +1,195 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .sinks import ReportSink, run_outcome
+from .statistical_analysis import StatisticalAnalysis, analyse_measure_from_test_sample
+
+SQLITE_FILE_NAME = "cat_ai_results.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS test_runs (
+    run_id TEXT PRIMARY KEY,
+    test_name TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    metadata TEXT
+);
+CREATE TABLE IF NOT EXISTS responses (
+    id INTEGER PRIMARY KEY,
+    sha256 TEXT NOT NULL UNIQUE,
+    content TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL REFERENCES test_runs(run_id),
+    test_name TEXT NOT NULL,
+    run_number INTEGER NOT NULL,
+    outcome TEXT NOT NULL,
+    passed INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    response_id INTEGER REFERENCES responses(id),
+    UNIQUE (run_id, run_number)
+);
+CREATE TABLE IF NOT EXISTS validations (
+    run INTEGER NOT NULL REFERENCES runs(id),
+    name TEXT NOT NULL,
+    passed INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_test_name ON runs(test_name, created_at);
+CREATE INDEX IF NOT EXISTS runs_run_id ON runs(run_id);
+CREATE INDEX IF NOT EXISTS runs_created_at ON runs(created_at);
+CREATE INDEX IF NOT EXISTS validations_name ON validations(name, run);
+CREATE INDEX IF NOT EXISTS test_runs_created_at ON test_runs(test_name, created_at);
+"""
+
+
+class SqliteSink(ReportSink):
+    """
+    Run records in normalized, indexed SQLite tables.
+
+    Records are buffered and inserted in one transaction per batch, so the
+    history of many CI runs can share one database file.
+    """
+
+    def __init__(self, path: str, batch_size: int = 100) -> None:
+        """
+        Initialize the SqliteSink with a database file.
+
+        Args:
+            path: SQLite database file, created with its schema if missing
+            batch_size: Records buffered before they are committed together
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pending: List[Dict[str, Any]] = []
+        self._known_run_ids: set[str] = set()
+        self._connection = connect(path)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self._pending.append({**record, "created_at": time.time()})
+            if len(self._pending) >= self.batch_size:
+                self._commit()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._commit()
+
+    def close(self) -> None:
+        self.flush()
+        self._connection.close()
+
+    def _commit(self) -> None:
+        if not self._pending:
+            return
+        with self._connection:
+            for record in self._pending:
+                self._insert(record)
+        self._pending.clear()
+
+    def _insert(self, record: Dict[str, Any]) -> None:
+        outcome = run_outcome(record)
+        if outcome is None:
+            return
+        run_number, passed = outcome
+        run_id = os.path.basename(record["folder_path"])
+        if run_id not in self._known_run_ids:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO test_runs (run_id, test_name, created_at, metadata) "
+                "VALUES (?, ?, ?, ?)",
+                (run_id, record["test_name"], record["created_at"], _read_metadata(record)),
+            )
+            self._known_run_ids.add(run_id)
+
+        response = json.dumps(record["response"])
+        digest = hashlib.sha256(response.encode("utf-8")).hexdigest()
+        self._connection.execute(
+            "INSERT OR IGNORE INTO responses (sha256, content) VALUES (?, ?)", (digest, response)
+        )
+        # A resumed or repeated run replaces its earlier row and validations
+        self._connection.execute(
+            "DELETE FROM validations WHERE run IN "
+            "(SELECT id FROM runs WHERE run_id = ? AND run_number = ?)",
+            (run_id, run_number),
+        )
+        cursor = self._connection.execute(
+            "INSERT OR REPLACE INTO runs (run_id, test_name, run_number, outcome, passed, "
+            "created_at, response_id) VALUES (?, ?, ?, ?, ?, ?, (SELECT id FROM responses WHERE sha256 = ?))",
+            (
+                run_id,
+                record["test_name"],
+                run_number,
+                record["output_file"].split("-", 1)[0],
+                int(passed),
+                record["created_at"],
+                digest,
+            ),
+        )
+        self._connection.executemany(
+            "INSERT INTO validations (run, name, passed) VALUES (?, ?, ?)",
+            [
+                (cursor.lastrowid, name, int(bool(value)))
+                for name, value in record["validations"].items()
+            ],
+        )
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """
+    Open a results database, creating its schema if needed.
+
+    Args:
+        path: SQLite database file
+
+    Returns:
+        Connection usable from any thread while guarded by the caller
+    """
+    connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def validation_failure_analysis(
+    path: str, validation_name: str, last_runs: int = 30, test_name: Optional[str] = None
+) -> StatisticalAnalysis:
+    """
+    Analyse how often a validation failed over the most recent test runs.
+
+    Args:
+        path: SQLite database file written by SqliteSink
+        validation_name: Name of the validation, e.g. no_developer_name_is_hallucinated
+        last_runs: Number of most recent test runs, e.g. CI runs, to include
+        test_name: Only include test runs of this test
+
+    Returns:
+        StatisticalAnalysis: Failure analysis of the validation
+    """
+    connection = connect(path)
+    try:
+        failures, total = connection.execute(
+            "SELECT COALESCE(SUM(1 - v.passed), 0), COUNT(*) FROM validations v "
+            "JOIN runs r ON r.id = v.run "
+            "WHERE v.name = ? AND r.run_id IN ("
+            "  SELECT run_id FROM test_runs WHERE (? IS NULL OR test_name = ?) "
+            "  ORDER BY created_at DESC LIMIT ?)",
+            (validation_name, test_name, test_name, last_runs),
+        ).fetchone()
+    finally:
+        connection.close()
+    if not total:
+        raise ValueError(f"No results for validation '{validation_name}' in {path}")
+    return analyse_measure_from_test_sample(failures, total)
+
+
+def _read_metadata(record: Dict[str, Any]) -> Optional[str]:
+    try:
+        with open(record["metadata_path"], encoding="utf-8") as file:
+            return file.read()
+    except (KeyError, OSError):
+        return None
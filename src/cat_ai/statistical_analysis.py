@@ -1,7 +1,17 @@
+import functools
 import math
-from dataclasses import astuple, dataclass
+import os
+from dataclasses import dataclass, fields
 from statistics import NormalDist
-from typing import Any, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None  # type: ignore[assignment]
+
+
+INTERVAL_METHODS = ("normal", "wilson", "clopper-pearson", "jeffreys")
 
 
 @dataclass
@@ -16,18 +26,57 @@ class StatisticalAnalysis:
     standard_error: float
     margin_of_error: float
     confidence_interval_prop: Tuple[float, float]
+    confidence_level: float = 0.90
+    method: str = "normal"
 
     def as_csv_row(self) -> list:
         """Return a flat tuple representation suitable for CSV writing."""
         # Unpack nested tuples for CSV-friendly format
         flat_data: list[Any] = []
-        for item in astuple(self):
+        for field in fields(self):
+            if field.name in ("confidence_level", "method"):
+                continue  # not CSV columns, so exports of every level and method share one layout
+            item = getattr(self, field.name)
             if isinstance(item, tuple):
                 flat_data.extend(item)
             else:
                 flat_data.append(item)
         return flat_data
 
+    @classmethod
+    def from_csv_row(
+        cls, row: Sequence[Any], confidence_level: float = 0.90, method: str = "normal"
+    ) -> "StatisticalAnalysis":
+        """Create an analysis from the values of as_csv_row()."""
+        (
+            measure,
+            sample_size,
+            margin_of_error_count,
+            lower_bound_count,
+            upper_bound_count,
+            p_hat,
+            se,
+            me,
+            lower_bound_prop,
+            upper_bound_prop,
+        ) = row
+        return cls(
+            observation=measure,
+            sample_size=sample_size,
+            margin_of_error_count=margin_of_error_count,
+            confidence_interval_count=(lower_bound_count, upper_bound_count),
+            proportion=p_hat,
+            standard_error=se,
+            margin_of_error=me,
+            # clamped bounds are the ints 0 and 1, as max(0, ...) and min(1, ...) return them
+            confidence_interval_prop=(
+                0 if lower_bound_prop <= 0 else lower_bound_prop,
+                1 if upper_bound_prop >= 1 else upper_bound_prop,
+            ),
+            confidence_level=confidence_level,
+            method=method,
+        )
+
     @classmethod
     def get_csv_headers(cls) -> list[str]:
         """Generate CSV headers based on class fields."""
@@ -47,7 +96,9 @@ class StatisticalAnalysis:
 
     def next_success_rate(self, current_success_rate: float) -> float:
         current_success_count = int(round(current_success_rate * self.sample_size, 0))
-        success_analysis = analyse_measure_from_test_sample(current_success_count, self.sample_size)
+        success_analysis = analyse_measure_from_test_sample(
+            current_success_count, self.sample_size, self.confidence_level, self.method
+        )
         lower_boundary = success_analysis.confidence_interval_prop[0]
         return (
             success_analysis.proportion
@@ -56,33 +107,326 @@ class StatisticalAnalysis:
         )
 
 
+@dataclass
+class SampleAccumulator:
+    """
+    Running failure count of a sample, analysable at any moment.
+
+    Adding an outcome is O(1) and merging accumulators only sums their counts,
+    so threads, processes and shards can each keep their own accumulator and
+    combine them at the end without going over the outcomes again. An
+    accumulator is not locked; guard it when threads share one.
+    """
+
+    failure_count: int = 0
+    sample_size: int = 0
+
+    @classmethod
+    def from_outcomes(cls, outcomes: Iterable[bool]) -> "SampleAccumulator":
+        """
+        Count a sequence of pass/fail outcomes.
+
+        Args:
+            outcomes: True for each passed run, False for each failed one
+
+        Returns:
+            SampleAccumulator: Accumulator holding the counts
+        """
+        accumulator = cls()
+        for passed in outcomes:
+            accumulator.add(passed)
+        return accumulator
+
+    @property
+    def success_count(self) -> int:
+        return self.sample_size - self.failure_count
+
+    def add(self, passed: bool) -> None:
+        """Count one outcome."""
+        self.sample_size += 1
+        self.failure_count += not passed
+
+    def merge(self, other: "SampleAccumulator") -> "SampleAccumulator":
+        """
+        Combine the counts of two accumulators.
+
+        Args:
+            other: Accumulator of another thread, process or shard
+
+        Returns:
+            SampleAccumulator: New accumulator holding both counts
+        """
+        return SampleAccumulator(
+            self.failure_count + other.failure_count, self.sample_size + other.sample_size
+        )
+
+    def __add__(self, other: "SampleAccumulator") -> "SampleAccumulator":
+        return self.merge(other)
+
+    def analysis(
+        self, confidence_level: Optional[float] = None, method: Optional[str] = None
+    ) -> StatisticalAnalysis:
+        """
+        Analyse the failures counted so far.
+
+        Args:
+            confidence_level: Confidence level of the interval, defaults to
+                              value from get_confidence_level() if None
+            method: Interval method, defaults to value from get_interval_method() if None
+
+        Returns:
+            StatisticalAnalysis: Failure analysis of the counted outcomes
+        """
+        if not self.sample_size:
+            raise ValueError("No outcomes counted")
+        return analyse_measure_from_test_sample(
+            self.failure_count, self.sample_size, confidence_level, method
+        )
+
+
 def analyse_sample_from_test(success_count: int, sample_size: int) -> StatisticalAnalysis:
     return analyse_measure_from_test_sample(measure=success_count, sample_size=sample_size)
 
 
-def analyse_measure_from_test_sample(measure: int, sample_size: int) -> StatisticalAnalysis:
+def get_confidence_level(default_level: float = 0.90) -> float:
+    """
+    Get the confidence level of the analysis from environment variable or use default.
+
+    Args:
+        default_level: Default level if CAT_AI_CONFIDENCE_LEVEL is not set
+
+    Returns:
+        Confidence level between 0 and 1, CAT_AI_CONFIDENCE_LEVEL may also be a percentage
+    """
+    level = float(os.getenv("CAT_AI_CONFIDENCE_LEVEL", str(default_level)))
+    return _check_confidence_level(level / 100 if level > 1 else level)
+
+
+@functools.lru_cache(maxsize=None)
+def z_score(confidence_level: float) -> float:
+    """
+    Get the two-tailed z-score of a confidence level, derived once per level.
+
+    Args:
+        confidence_level (float): Confidence level between 0 and 1, such as 0.90
+
+    Returns:
+        float: z-score, 1.645 for a 90% confidence level
+    """
+    _check_confidence_level(confidence_level)
+    # For a two-tailed, we need (1 + confidence_level)/2 percentile
+    confidence_percentile = (1 + confidence_level) / 2  # Derives 0.95 from 90% confidence
+    return NormalDist().inv_cdf(confidence_percentile)
+
+
+def _check_confidence_level(confidence_level: float) -> float:
+    if not 0 < confidence_level < 1:
+        raise ValueError(f"Confidence level must be between 0 and 1, got {confidence_level}")
+    return confidence_level
+
+
+def get_interval_method(default_method: str = "normal") -> str:
+    """
+    Get the confidence interval method from environment variable or use default.
+
+    Args:
+        default_method: Default method if CAT_AI_INTERVAL_METHOD is not set
+
+    Returns:
+        One of INTERVAL_METHODS
+    """
+    return _check_method(os.getenv("CAT_AI_INTERVAL_METHOD", default_method))
+
+
+def _check_method(method: str) -> str:
+    if method not in INTERVAL_METHODS:
+        raise ValueError(f"Unknown interval method '{method}', use one of {INTERVAL_METHODS}")
+    return method
+
+
+def analyse_measure_from_test_sample(
+    measure: int,
+    sample_size: int,
+    confidence_level: Optional[float] = None,
+    method: Optional[str] = None,
+) -> StatisticalAnalysis:
     """
     Calculate the error margin and confidence interval for a given sample.
 
     Args:
         measure (int): Number of failures in the sample
         sample_size (int): Total size of the sample
+        confidence_level (Optional[float]): Confidence level of the interval, defaults to
+            value from get_confidence_level() if None
+        method (Optional[str]): Interval method, one of INTERVAL_METHODS, defaults to
+            value from get_interval_method() if None
 
     Returns:
         StatisticalAnalysis: Object containing all statistical analysis data
     """
-    # Calculate sample proportion
+    if confidence_level is None:
+        confidence_level = get_confidence_level()
+    return _analyse(measure, sample_size, confidence_level, method or get_interval_method())
+
+
+def _analyse(
+    measure: int, sample_size: int, confidence_level: float, method: str = "normal"
+) -> StatisticalAnalysis:
+    if method == "normal":
+        row = _analysis_csv_row(measure, sample_size, z_score(confidence_level))
+    else:
+        bounds = confidence_interval(measure, sample_size, confidence_level, method)
+        row = _interval_csv_row(measure, sample_size, *bounds)
+    return StatisticalAnalysis.from_csv_row(row, confidence_level, method)
+
+
+@functools.lru_cache(maxsize=65536)
+def confidence_interval(
+    measure: int, sample_size: int, confidence_level: float = 0.90, method: str = "normal"
+) -> Tuple[float, float]:
+    """
+    Calculate the confidence interval of a proportion, cached per arguments.
+
+    "normal" is the Wald interval used by default, which collapses to zero width
+    at 0 or sample_size. "wilson" is the Wilson score interval, "clopper-pearson"
+    the exact interval from beta quantiles, which never undercovers, and
+    "jeffreys" the equal-tailed interval of the Jeffreys prior. The last three
+    stay informative for small samples and for 0 or sample_size failures.
+
+    Args:
+        measure (int): Number of failures in the sample
+        sample_size (int): Total size of the sample
+        confidence_level (float): Confidence level of the interval
+        method (str): Interval method, one of INTERVAL_METHODS
+
+    Returns:
+        Tuple[float, float]: Lower and upper bound of the proportion
+    """
+    _check_method(method)
+    if sample_size <= 0:
+        raise ValueError(f"Sample size must be positive, got {sample_size}")
+    if not 0 <= measure <= sample_size:
+        raise ValueError(f"Measure must be between 0 and {sample_size}, got {measure}")
     p_hat = measure / sample_size
+    z = z_score(confidence_level)
+    if method == "normal":
+        me = z * math.sqrt(p_hat * (1 - p_hat) / sample_size)
+        return max(0.0, p_hat - me), min(1.0, p_hat + me)
+    if method == "wilson":
+        z2_n = z * z / sample_size
+        center = (p_hat + z2_n / 2) / (1 + z2_n)
+        half_width = (
+            z / (1 + z2_n) * math.sqrt(p_hat * (1 - p_hat) / sample_size + z2_n / (4 * sample_size))
+        )
+        # center -/+ half_width leaves float residue at the edges, where the bounds are exact
+        lower = 0.0 if measure == 0 else max(0.0, center - half_width)
+        upper = 1.0 if measure == sample_size else min(1.0, center + half_width)
+        return lower, upper
 
-    # Define our 90% confidence level as a constant
-    confidence_for_non_determinism: int = 90
-    confidence_level_percent = confidence_for_non_determinism
-    confidence_level = confidence_level_percent / 100.0
+    tail = (1 - confidence_level) / 2
+    prior = 0.5 if method == "jeffreys" else 0.0
+    lower = (
+        0.0
+        if measure == 0
+        else _beta_quantile(tail, measure + prior, sample_size - measure + 1 - prior)
+    )
+    upper = (
+        1.0
+        if measure == sample_size
+        else _beta_quantile(1 - tail, measure + 1 - prior, sample_size - measure + prior)
+    )
+    return lower, upper
+
+
+def _interval_csv_row(
+    measure: int, sample_size: int, lower_bound_prop: float, upper_bound_prop: float
+) -> Tuple[Any, ...]:
+    p_hat = measure / sample_size
+    se = math.sqrt(p_hat * (1 - p_hat) / sample_size)
+    # intervals of the exact methods are not symmetric around p_hat, use their half width
+    me = (upper_bound_prop - lower_bound_prop) / 2
+    # every method's interval contains p_hat, keep rounding from excluding the observed count
+    lower_bound_count: int = min(math.ceil(lower_bound_prop * sample_size), measure)
+    upper_bound_count: int = max(int(upper_bound_prop * sample_size), measure)
+    half_max_distance = (upper_bound_count - lower_bound_count) / 2
+    margin_of_error_count = int(max(me * sample_size, half_max_distance))
+    return (
+        measure,
+        sample_size,
+        margin_of_error_count,
+        lower_bound_count,
+        upper_bound_count,
+        p_hat,
+        se,
+        me,
+        lower_bound_prop,
+        upper_bound_prop,
+    )
+
+
+def _beta_quantile(probability: float, a: float, b: float) -> float:
+    # Newton steps on the regularized incomplete beta function, which increases with x,
+    # falling back to bisection whenever a step leaves the bracket around the root.
+    low, high = 0.0, 1.0
+    x = a / (a + b)
+    log_beta = math.lgamma(a) + math.lgamma(b) - math.lgamma(a + b)
+    for _ in range(200):
+        error = _regularized_incomplete_beta(x, a, b) - probability
+        if error < 0:
+            low = x
+        else:
+            high = x
+        density = math.exp((a - 1) * math.log(x) + (b - 1) * math.log1p(-x) - log_beta)
+        step = error / density if density > 0 else math.inf
+        next_x = x - step
+        if not low < next_x < high:
+            next_x = (low + high) / 2
+        if abs(next_x - x) <= 1e-15 * max(x, 1e-300) or high - low <= 1e-300:
+            return next_x
+        x = next_x
+    return x
+
+
+def _regularized_incomplete_beta(x: float, a: float, b: float) -> float:
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    log_front = (
+        math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log1p(-x)
+    )
+    # The continued fraction converges quickly on this side of the mean, use symmetry otherwise
+    if x < (a + 1) / (a + b + 2):
+        return math.exp(log_front) * _beta_continued_fraction(x, a, b) / a
+    return 1 - math.exp(log_front) * _beta_continued_fraction(1 - x, b, a) / b
+
+
+def _beta_continued_fraction(x: float, a: float, b: float) -> float:
+    # Modified Lentz evaluation of the continued fraction of the incomplete beta function
+    tiny = 1e-300
+    c = 1.0
+    d = 1 - (a + b) * x / (a + 1)
+    d = 1 / (d if abs(d) > tiny else tiny)
+    result = d
+    for m in range(1, 10_000):
+        for numerator in (
+            m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+            -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1)),
+        ):
+            d = 1 + numerator * d
+            d = 1 / (d if abs(d) > tiny else tiny)
+            c = 1 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            result *= c * d
+        if abs(c * d - 1) < 1e-15:
+            break
+    return result
+
+
+def _analysis_csv_row(measure: int, sample_size: int, z: float) -> Tuple[Any, ...]:
+    # Calculate sample proportion
+    p_hat = measure / sample_size
 
-    # For a two-tailed, we need (1 + confidence_level)/2 percentile
-    confidence_percentile = (1 + confidence_level) / 2  # Derives 0.95 from our 90% constant
-    # Calculate the appropriate z-score for our confidence level
-    z = NormalDist().inv_cdf(confidence_percentile)
     # Calculate standard error
     se = math.sqrt(p_hat * (1 - p_hat) / sample_size)
 
@@ -101,13 +445,221 @@ def analyse_measure_from_test_sample(measure: int, sample_size: int) -> Statisti
     margin_of_error: float = me * sample_size
     margin_of_error_count = int(max(margin_of_error, half_max_distance))
 
-    return StatisticalAnalysis(
-        observation=measure,
-        sample_size=sample_size,
-        margin_of_error_count=margin_of_error_count,
-        confidence_interval_count=(lower_bound_count, upper_bound_count),
-        proportion=p_hat,
-        standard_error=se,
-        margin_of_error=me,
-        confidence_interval_prop=(lower_bound_prop, upper_bound_prop),
+    return (
+        measure,
+        sample_size,
+        margin_of_error_count,
+        lower_bound_count,
+        upper_bound_count,
+        p_hat,
+        se,
+        me,
+        lower_bound_prop,
+        upper_bound_prop,
+    )
+
+
+def analysis_columns(
+    measures: Sequence[int],
+    sample_sizes: Sequence[int],
+    use_numpy: Optional[bool] = None,
+    confidence_level: Optional[float] = None,
+    method: Optional[str] = None,
+) -> Dict[str, Sequence[Any]]:
+    """
+    Analyse many samples at once, returning one column per CSV header.
+
+    Gives the same values as calling analyse_measure_from_test_sample() for every
+    pair, but derives the z-score once and is vectorized with NumPy when it is
+    installed.
+
+    Args:
+        measures (Sequence[int]): Number of failures in each sample
+        sample_sizes (Sequence[int]): Total size of each sample
+        use_numpy (Optional[bool]): Force or forbid NumPy, defaults to using it when installed
+        confidence_level (Optional[float]): Confidence level of the intervals, defaults to
+            value from get_confidence_level() if None
+        method (Optional[str]): Interval method, defaults to value from
+            get_interval_method() if None. Only "normal" is vectorized
+
+    Returns:
+        Dict[str, Sequence]: Columns keyed by StatisticalAnalysis.get_csv_headers(),
+            NumPy arrays when NumPy is used and lists otherwise
+    """
+    z = _batch_z_score(measures, sample_sizes, confidence_level)
+    headers = StatisticalAnalysis.get_csv_headers()
+    method = method or get_interval_method()
+    if method != "normal":
+        analyses = analyse_measures_from_test_samples(
+            measures, sample_sizes, False, confidence_level, method
+        )
+        values = list(zip(*(analysis.as_csv_row() for analysis in analyses), strict=True))
+        columns: List[Any] = [list(column) for column in values] or [[] for _ in headers]
+        if _use_numpy(use_numpy):
+            columns = [np.asarray(column) for column in columns]
+        return dict(zip(headers, columns, strict=True))
+    if not _use_numpy(use_numpy):
+        rows = [
+            _analysis_csv_row(measure, sample_size, z)
+            for measure, sample_size in zip(measures, sample_sizes, strict=True)
+        ]
+        return {header: [row[i] for row in rows] for i, header in enumerate(headers)}
+
+    measure = np.asarray(measures, dtype=np.int64)
+    sample_size = np.asarray(sample_sizes, dtype=np.int64)
+    p_hat = measure / sample_size
+    se = np.sqrt(p_hat * (1 - p_hat) / sample_size)
+    me = z * se
+    lower_bound_prop = np.maximum(0.0, p_hat - me)
+    upper_bound_prop = np.minimum(1.0, p_hat + me)
+    lower_bound_count = np.ceil(lower_bound_prop * sample_size).astype(np.int64)
+    upper_bound_count = np.floor(upper_bound_prop * sample_size).astype(np.int64)
+    half_max_distance = (upper_bound_count - lower_bound_count) / 2
+    margin_of_error_count = np.floor(np.maximum(me * sample_size, half_max_distance))
+    columns = [
+        measure,
+        sample_size,
+        margin_of_error_count.astype(np.int64),
+        lower_bound_count,
+        upper_bound_count,
+        p_hat,
+        se,
+        me,
+        lower_bound_prop,
+        upper_bound_prop,
+    ]
+    return dict(zip(headers, columns, strict=True))
+
+
+def analyse_measures_from_test_samples(
+    measures: Sequence[int],
+    sample_sizes: Sequence[int],
+    use_numpy: Optional[bool] = None,
+    confidence_level: Optional[float] = None,
+    method: Optional[str] = None,
+) -> List[StatisticalAnalysis]:
+    """
+    Calculate the error margin and confidence interval for many samples at once.
+
+    Args:
+        measures (Sequence[int]): Number of failures in each sample
+        sample_sizes (Sequence[int]): Total size of each sample
+        use_numpy (Optional[bool]): Force or forbid NumPy, defaults to using it when installed
+        confidence_level (Optional[float]): Confidence level of the intervals, defaults to
+            value from get_confidence_level() if None
+        method (Optional[str]): Interval method, defaults to value from
+            get_interval_method() if None. Only "normal" is vectorized
+
+    Returns:
+        List[StatisticalAnalysis]: One analysis per sample, equal to the result of
+            analyse_measure_from_test_sample()
+    """
+    level = confidence_level if confidence_level is not None else get_confidence_level()
+    method = method or get_interval_method()
+    if method != "normal":
+        _batch_z_score(measures, sample_sizes, level)
+        return [
+            _analyse(measure, sample_size, level, method)
+            for measure, sample_size in zip(measures, sample_sizes, strict=True)
+        ]
+    if not _use_numpy(use_numpy):
+        z = _batch_z_score(measures, sample_sizes, level)
+        return [
+            StatisticalAnalysis.from_csv_row(_analysis_csv_row(measure, sample_size, z), level)
+            for measure, sample_size in zip(measures, sample_sizes, strict=True)
+        ]
+    columns = analysis_columns(measures, sample_sizes, use_numpy=True, confidence_level=level)
+    rows = zip(*(np.asarray(column).tolist() for column in columns.values()), strict=True)
+    return [StatisticalAnalysis.from_csv_row(row, level) for row in rows]
+
+
+def _batch_z_score(
+    measures: Sequence[int], sample_sizes: Sequence[int], confidence_level: Optional[float]
+) -> float:
+    if len(measures) != len(sample_sizes):
+        raise ValueError(f"Got {len(measures)} measures for {len(sample_sizes)} sample sizes")
+    if any(sample_size <= 0 for sample_size in sample_sizes):
+        raise ValueError("Sample sizes must be positive")
+    return z_score(confidence_level if confidence_level is not None else get_confidence_level())
+
+
+def _use_numpy(use_numpy: Optional[bool]) -> bool:
+    if use_numpy and np is None:
+        raise ImportError("use_numpy=True needs the numpy package")
+    return np is not None if use_numpy is None else use_numpy
+
+
+def required_sample_size(
+    expected_success_rate: float, margin_of_error: float, confidence_level: Optional[float] = None
+) -> int:
+    """
+    Calculate the minimum sample size that measures a success rate within a margin of error.
+
+    The normal approximation has no variance at a success rate of 0 or 1, which
+    would plan a single run, so the expected success rate must lie strictly
+    between 0 and 1.
+
+    Args:
+        expected_success_rate (float): Success rate the test is expected to reach
+        margin_of_error (float): Largest acceptable distance between measured and true rate
+        confidence_level (Optional[float]): Confidence that the true rate lies within the
+            margin, defaults to value from get_confidence_level() if None
+
+    Returns:
+        int: Number of samples needed, at least 1
+    """
+    if not 0 < expected_success_rate < 1:
+        raise ValueError(
+            f"Expected success rate must be between 0 and 1, got {expected_success_rate}"
+        )
+    if not 0 < margin_of_error < 1:
+        raise ValueError(f"Margin of error must be between 0 and 1, got {margin_of_error}")
+    if confidence_level is None:
+        confidence_level = get_confidence_level()
+    z = z_score(confidence_level)
+    variance = expected_success_rate * (1 - expected_success_rate)
+    return max(1, math.ceil(z**2 * variance / margin_of_error**2))
+
+
+def sequential_decision(
+    success_count: int,
+    sample_size: int,
+    expected_success_rate: float,
+    tolerance: float = 0.05,
+    error_rate: float = 0.05,
+) -> Optional[bool]:
+    """
+    Decide whether a sample has settled pass or fail with Wald's sequential probability ratio test.
+
+    The test weighs a success rate of expected_success_rate + tolerance (pass) against
+    expected_success_rate - tolerance (fail). Both hypotheses are kept strictly inside (0, 1),
+    so a single failure cannot settle a near-perfect expectation on its own.
+
+    Args:
+        success_count (int): Number of successes observed so far
+        sample_size (int): Number of runs observed so far
+        expected_success_rate (float): Success rate the test is expected to reach
+        tolerance (float): Half width of the indifference region around the expected rate
+        error_rate (float): Probability of each wrong decision, 0.05 on each side matches
+            the 90% confidence used by analyse_measure_from_test_sample
+
+    Returns:
+        Optional[bool]: True when the pass rate is settled, False when the fail rate is
+            settled, None when more samples are needed
+    """
+    if not 0 < expected_success_rate < 1:
+        raise ValueError(
+            f"Expected success rate must be between 0 and 1, got {expected_success_rate}"
+        )
+    pass_rate = min(expected_success_rate + tolerance, (1 + expected_success_rate) / 2)
+    fail_rate = max(expected_success_rate - tolerance, expected_success_rate / 2)
+    failure_count = sample_size - success_count
+
+    log_likelihood_ratio = success_count * math.log(pass_rate / fail_rate) + failure_count * (
+        math.log((1 - pass_rate) / (1 - fail_rate))
     )
+    if log_likelihood_ratio >= math.log((1 - error_rate) / error_rate):
+        return True
+    if log_likelihood_ratio <= math.log(error_rate / (1 - error_rate)):
+        return False
+    return None
@@ -0,0 +1,76 @@
+import json
+import tarfile
+import zipfile
+
+import pytest
+
+from cat_ai.archive import ArchiveSink, archive_directory
+from cat_ai.reporter import Reporter
+
+
+def report_runs(reporter: Reporter) -> None:
+    for run_number in range(3):
+        reporter.for_run(run_number).report(f"response {run_number}", {"ok": run_number != 1})
+
+
+def test_archive_sink_streams_records_as_reported(tmp_path, test_name):
+    archive_path = str(tmp_path / "runs.zip")
+    with Reporter(
+        test_name,
+        str(tmp_path),
+        unique_id="ci-7",
+        metadata={"ai-model": "champion-1"},
+        sinks=[ArchiveSink(archive_path)],
+    ) as reporter:
+        report_runs(reporter)
+
+    with zipfile.ZipFile(archive_path) as archive:
+        folder = f"{test_name}-ci-7"
+        assert sorted(archive.namelist()) == [
+            f"{folder}/fail-1.json",
+            f"{folder}/metadata.json",
+            f"{folder}/pass-0.json",
+            f"{folder}/pass-2.json",
+        ]
+        assert json.loads(archive.read(f"{folder}/fail-1.json"))["response"] == "response 1"
+
+
+@pytest.mark.parametrize("archive_name", ["test_runs.zip", "test_runs.tar.gz"])
+def test_archive_directory_in_one_pass(tmp_path, test_name, archive_name):
+    report_runs(Reporter(test_name, str(tmp_path), unique_id="ci-8", output_format="json"))
+    (tmp_path / "test_runs" / "partial.json.tmp").write_text("{")
+    archive_path = str(tmp_path / "test_runs" / archive_name)
+
+    assert archive_directory(str(tmp_path / "test_runs"), archive_path) == 4
+
+    folder = f"{test_name}-ci-8"
+    expected = {
+        f"{folder}/{name}"
+        for name in ["metadata.json", "pass-0.json", "fail-1.json", "pass-2.json"]
+    }
+    if archive_name.endswith(".zip"):
+        with zipfile.ZipFile(archive_path) as archive:
+            assert set(archive.namelist()) == expected
+    else:
+        with tarfile.open(archive_path) as archive:
+            assert set(archive.getnames()) == expected
+
+
+def test_archive_directory_keeps_the_arcname_root(tmp_path, test_name):
+    report_runs(Reporter(test_name, str(tmp_path), unique_id="ci-9", output_format="json"))
+    archive_path = str(tmp_path / "runs.zip")
+
+    archive_directory(
+        str(tmp_path / "test_runs"), archive_path, "examples/team_recommender/test_runs"
+    )
+
+    with zipfile.ZipFile(archive_path) as archive:
+        names = archive.namelist()
+    assert f"examples/team_recommender/test_runs/{test_name}-ci-9/pass-0.json" in names
+    # the reliability dashboard only counts members nested below the test run folder
+    assert all(len(name.split("/")) > 3 for name in names)
+
+
+def test_unknown_archive_format(tmp_path):
+    with pytest.raises(ValueError):
+        archive_directory(str(tmp_path), str(tmp_path / "runs.rar"))
@@ -0,0 +1,73 @@
+import asyncio
+import os
+
+import pytest
+
+from cat_ai.async_runner import AsyncRunner
+from cat_ai.reporter import Reporter
+
+
+@pytest.mark.parametrize("return_value", [True, False])
+async def test_run_once(tmp_reporter: Reporter, return_value: bool) -> None:
+    async def test_function(_: Reporter) -> bool:
+        return return_value
+
+    runner = AsyncRunner(test_function=test_function, reporter=tmp_reporter)
+
+    assert await runner.run_once() is return_value
+
+
+async def test_run_multiple_keeps_run_order_and_limits_concurrency(tmp_path, test_name):
+    reporter = Reporter(test_name=test_name, output_dir=str(tmp_path), unique_id="async")
+    in_flight = 0
+    max_in_flight = 0
+
+    async def test_function(run_reporter: Reporter) -> bool:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01 * (5 - run_reporter.run_number))
+        in_flight -= 1
+        return await run_reporter.areport("response", {"even": run_reporter.run_number % 2 == 0})
+
+    runner = AsyncRunner(test_function=test_function, reporter=reporter, max_concurrency=2)
+
+    results = await runner.run_multiple(sample_size=5)
+
+    assert results == [True, False, True, False, True]
+    assert max_in_flight == 2
+    assert "fail-3.json" in os.listdir(reporter.folder_path)
+
+
+async def test_run_that_exceeds_timeout_fails(tmp_reporter):
+    async def test_function(run_reporter: Reporter) -> bool:
+        await asyncio.sleep(10 if run_reporter.run_number == 1 else 0)
+        return True
+
+    runner = AsyncRunner(test_function=test_function, reporter=tmp_reporter, timeout=0.05)
+
+    assert await runner.run_multiple(sample_size=3, max_concurrency=3) == [True, False, True]
+
+
+async def test_cancelling_run_multiple_cancels_pending_runs(tmp_reporter):
+    started = []
+    cancelled = []
+
+    async def test_function(run_reporter: Reporter) -> bool:
+        started.append(run_reporter.run_number)
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(run_reporter.run_number)
+            raise
+        return True
+
+    runner = AsyncRunner(test_function=test_function, reporter=tmp_reporter, max_concurrency=2)
+    task = asyncio.create_task(runner.run_multiple(sample_size=4))
+    await asyncio.sleep(0.01)
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert started == [0, 1]
+    assert sorted(cancelled) == [0, 1]
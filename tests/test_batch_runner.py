@@ -0,0 +1,50 @@
+import os
+import threading
+
+from cat_ai.batch_runner import BatchRunner
+from cat_ai.reporter import Reporter
+
+
+def test_batch_runner_max_generations(monkeypatch):
+    monkeypatch.setenv("CAT_AI_MAX_GENERATIONS", "8")
+    assert BatchRunner.get_max_generations() == 8
+
+    monkeypatch.delenv("CAT_AI_MAX_GENERATIONS", raising=False)
+    assert BatchRunner.get_max_generations() == 128
+
+
+def test_run_multiple_splits_sample_size_into_batches(tmp_path, test_name):
+    reporter = Reporter(test_name=test_name, output_dir=str(tmp_path), unique_id="batches")
+    requested = []
+    lock = threading.Lock()
+    counter = iter(range(100))
+
+    def generate(n: int) -> list[str]:
+        with lock:
+            requested.append(n)
+            return [str(next(counter)) for _ in range(n)]
+
+    def validate(run_reporter: Reporter, response: str) -> bool:
+        return run_reporter.report(response, {"even": int(response) % 2 == 0})
+
+    runner = BatchRunner(generate=generate, validate=validate, reporter=reporter, max_generations=4)
+
+    results = runner.run_multiple(sample_size=10)
+
+    assert sorted(requested) == [2, 4, 4]
+    assert len(results) == 10
+    assert sum(results) == 5
+    run_files = {f for f in os.listdir(reporter.folder_path) if f.endswith(".json")}
+    run_files.discard("metadata.json")
+    assert {f.split("-")[1] for f in run_files} == {f"{i}.json" for i in range(10)}
+
+
+def test_run_multiple_validates_what_the_generator_returned(tmp_reporter):
+    runner = BatchRunner(
+        generate=lambda n: ["only one"],
+        validate=lambda reporter, response: reporter.run_number == 0,
+        reporter=tmp_reporter,
+        max_generations=3,
+    )
+
+    assert runner.run_multiple(sample_size=3) == [True]
@@ -0,0 +1,70 @@
+import json
+import os
+
+from cat_ai.blob_store import BlobStore
+from cat_ai.reporter import Reporter
+from cat_ai.sinks import read_run_records
+
+SKILLS = {"skills": [{"name": f"skill {i}", "developers": ["Sam Thomas"] * 10} for i in range(20)]}
+
+
+def blob_files(root: str) -> list[str]:
+    return [name for _, _, names in os.walk(root) for name in names]
+
+
+def test_put_stores_each_value_once_compressed(tmp_path):
+    store = BlobStore(str(tmp_path))
+
+    digest = store.put(SKILLS)
+
+    assert store.put(json.loads(json.dumps(SKILLS))) == digest
+    assert store.get(digest) == SKILLS
+    assert blob_files(str(tmp_path)) == [f"{digest}.json.gz"]
+    compressed_size = os.path.getsize(tmp_path / digest[:2] / f"{digest}.json.gz")
+    assert compressed_size * 10 < len(json.dumps(SKILLS))
+
+
+def test_small_values_stay_inline(tmp_path):
+    store = BlobStore(str(tmp_path), min_size=20)
+
+    assert store.externalize("champion-1") == "champion-1"
+    reference = store.externalize("x" * 30)
+    assert list(reference) == ["$blob"]
+    assert store.resolve({"model": "champion-1", "prompt": reference}) == {
+        "model": "champion-1",
+        "prompt": "x" * 30,
+    }
+
+
+def test_reporters_share_blobs_across_test_runs(tmp_path, test_name):
+    metadata = {"ai-model": "champion-1", "system_prompt": f"Pick developers from {SKILLS}"}
+    response = json.dumps({"developers": [{"name": "Sam Thomas", "skills": SKILLS["skills"][:5]}]})
+
+    for ci_run in range(3):
+        reporter = Reporter(
+            test_name,
+            str(tmp_path),
+            unique_id=f"ci-{ci_run}",
+            metadata=metadata,
+            blob_store=BlobStore(str(tmp_path / "test_runs" / "blobs")),
+        )
+        for run_number in range(5):
+            reporter.for_run(run_number).report(response, {"ok": True})
+
+    assert len(blob_files(str(tmp_path / "test_runs" / "blobs"))) == 2
+    with open(os.path.join(reporter.folder_path, "metadata.json")) as file:
+        stored_metadata = json.load(file)
+    assert stored_metadata["ai-model"] == "champion-1"
+    assert list(stored_metadata["system_prompt"]) == ["$blob"]
+    assert [record["response"] for record in read_run_records(reporter.folder_path)] == [
+        response
+    ] * 5
+
+
+def test_blob_store_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("CAT_AI_BLOB_STORE", "1")
+
+    reporter = Reporter("env_blobs", str(tmp_path))
+
+    assert reporter.blob_store is not None
+    assert reporter.blob_store.root == str(tmp_path / "test_runs" / "blobs")
@@ -0,0 +1,68 @@
+import json
+from typing import Any, List, Sequence
+
+import pytest
+
+from cat_ai import interval_table
+from cat_ai.interval_table import IntervalTable, get_interval_table
+from cat_ai.statistical_analysis import analyse_measure_from_test_sample
+
+
+@pytest.mark.parametrize(
+    "confidence_level, method", [(0.90, "normal"), (0.95, "normal"), (0.90, "jeffreys")]
+)
+def test_lookups_match_the_analysis(confidence_level, method):
+    table = IntervalTable(max_sample_size=50, confidence_level=confidence_level, method=method)
+
+    for sample_size in (1, 7, 50, 51):
+        for measure in range(sample_size + 1):
+            assert table.analysis(measure, sample_size) == analyse_measure_from_test_sample(
+                measure, sample_size, confidence_level, method
+            )
+
+
+def test_rows_are_computed_once_per_sample_size(monkeypatch):
+    table = IntervalTable(max_sample_size=100, confidence_level=0.90)
+    computed = []
+    compute_rows = table._compute_rows
+
+    def spy(sample_size: int) -> List[Sequence[Any]]:
+        computed.append(sample_size)
+        return compute_rows(sample_size)
+
+    monkeypatch.setattr(table, "_compute_rows", spy)
+
+    for measure in range(11):
+        table.confidence_interval_count(measure, 10)
+    table.confidence_interval_count(3, 20)
+
+    assert computed == [10, 20]
+
+
+def test_rows_are_persisted_to_the_cache_file(tmp_path):
+    cache_path = str(tmp_path / "intervals.json")
+    table = IntervalTable(max_sample_size=100, confidence_level=0.90, cache_path=cache_path)
+    expected = table.analysis(6, 100)
+    table.save()
+
+    cached = IntervalTable(max_sample_size=100, confidence_level=0.90, cache_path=cache_path)
+    assert list(cached._rows) == [100]
+    assert cached.analysis(6, 100) == expected
+
+    other_level = IntervalTable(max_sample_size=100, confidence_level=0.95, cache_path=cache_path)
+    assert other_level._rows == {}
+    with open(cache_path) as file:
+        assert json.load(file)["confidence_level"] == 0.90
+
+
+def test_interval_table_from_env(monkeypatch, tmp_path):
+    monkeypatch.setattr(interval_table, "_tables", {})
+    monkeypatch.setenv("CAT_AI_CONFIDENCE_LEVEL", "95")
+    monkeypatch.setenv("CAT_AI_INTERVAL_TABLE_SIZE", "200")
+
+    table = get_interval_table()
+
+    assert table.confidence_level == 0.95
+    assert table.max_sample_size == 200
+    assert get_interval_table() is table
+    assert table.analysis(1, 10).confidence_level == 0.95
@@ -0,0 +1,128 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from cat_ai.outcomes import OutcomeBitset, OutcomeCounters
+from cat_ai.reporter import Reporter
+from cat_ai.runner import Runner
+from cat_ai.statistical_analysis import SampleAccumulator, analyse_measure_from_test_sample
+
+
+def test_bitset_keeps_two_bits_per_run():
+    history = OutcomeBitset()
+    for run_number in range(0, 100_000, 3):
+        history.set(run_number, run_number % 2 == 0)
+    history.set(3, True)
+
+    assert len(history) == 33_334
+    assert history.get(0) is True
+    assert history.get(1) is None
+    assert history.get(3) is True
+    assert history.get(9) is False
+    assert history.get(100_000) is None
+    assert history.failed_runs()[:3] == [9, 15, 21]
+    assert len(history._recorded) + len(history._passed) == 2 * 12_500
+
+
+def test_bitset_rejects_negative_run_numbers():
+    with pytest.raises(ValueError):
+        OutcomeBitset().set(-1, True)
+
+
+def test_counters_count_runs_and_validations():
+    counters = OutcomeCounters(keep_history=True)
+
+    counters.add_validations({"valid_json": True, "no_hallucination": True}, run_number=0)
+    counters.add_validations({"valid_json": True, "no_hallucination": False}, run_number=1)
+    counters.add_validations({"valid_json": False}, run_number=2)
+
+    assert counters.counts() == (2, 3)
+    assert counters.success_count == 1
+    assert counters.counts("no_hallucination") == (1, 2)
+    assert counters.validation_names == ["valid_json", "no_hallucination"]
+    assert counters.analysis("valid_json") == analyse_measure_from_test_sample(1, 3)
+    assert counters.history is not None
+    assert list(counters.history) == [(0, True), (1, False), (2, False)]
+
+
+def test_analysis_needs_counted_outcomes():
+    with pytest.raises(ValueError, match="unknown"):
+        OutcomeCounters().analysis("unknown")
+
+
+def test_counters_are_safe_to_update_concurrently():
+    counters = OutcomeCounters()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for run_number in range(1000):
+            executor.submit(counters.add, run_number % 4 != 0, run_number)
+
+    assert counters.counts() == (250, 1000)
+
+
+def test_reporter_updates_counters(tmp_path, test_name):
+    counters = OutcomeCounters()
+    reporter = Reporter(test_name, str(tmp_path), outcome_counters=counters)
+
+    reporter.for_run(0).report("response", {"a": True, "b": True})
+    reporter.for_run(1).report("response", {"a": False, "b": True})
+    reporter.for_run(2).report_timeout(1.0)
+
+    assert counters.counts() == (2, 3)
+    assert counters.counts("a") == (1, 2)
+    assert counters.counts("finished_within_deadline") == (1, 1)
+
+
+def test_run_counted_refuses_the_reporter_counters(tmp_reporter):
+    runner = Runner(lambda reporter: reporter.report("response", {"ok": True}), tmp_reporter)
+
+    with pytest.raises(ValueError, match="already count every reported run"):
+        runner.run_counted(sample_size=3, counters=tmp_reporter.outcome_counters)
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_run_counted_matches_run_multiple(tmp_reporter, max_workers):
+    runner = Runner(lambda reporter: reporter.run_number % 5 != 0, tmp_reporter)
+
+    counters = runner.run_counted(sample_size=103, max_workers=max_workers, chunk_size=10)
+
+    results = runner.run_multiple(sample_size=103, max_workers=max_workers)
+    assert counters.counts() == (results.count(False), len(results))
+
+
+def test_run_counted_resumes_the_reported_runs(tmp_path, test_name):
+    def report_odd_runs_as_passed(run_reporter: Reporter) -> bool:
+        return run_reporter.report("response", {"odd": run_reporter.run_number % 2 == 1})
+
+    first = Reporter(test_name, str(tmp_path), unique_id="counted")
+    Runner(report_odd_runs_as_passed, first).run_counted(sample_size=5)
+    executed = []
+
+    def record_run(run_reporter: Reporter) -> bool:
+        executed.append(run_reporter.run_number)
+        return report_odd_runs_as_passed(run_reporter)
+
+    resumed = Reporter(test_name, str(tmp_path), unique_id="counted")
+    counters = Runner(record_run, resumed, resume=True).run_counted(
+        sample_size=8, counters=OutcomeCounters(keep_history=True), chunk_size=2
+    )
+
+    assert sorted(executed) == [5, 6, 7]
+    assert counters.counts() == (4, 8)
+    assert counters.history is not None
+    assert counters.history.failed_runs() == [0, 2, 4, 6]
+
+
+def test_counters_of_workers_merge():
+    workers = [OutcomeCounters(keep_history=True) for _ in range(2)]
+    for run_number in range(10):
+        workers[run_number % 2].add_validations({"a": run_number != 3}, run_number)
+    merged = OutcomeCounters(keep_history=True)
+
+    for worker in workers:
+        merged.merge(worker)
+
+    assert merged.counts() == (1, 10)
+    assert merged.accumulator("a") == SampleAccumulator(failure_count=1, sample_size=10)
+    assert merged.history is not None
+    assert merged.history.failed_runs() == [3]
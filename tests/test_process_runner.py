@@ -0,0 +1,46 @@
+import json
+import os
+
+from cat_ai.process_runner import ProcessPoolRunner, _worker_context
+from cat_ai.reporter import Reporter
+
+
+def check_in_worker(response: str) -> dict[str, bool]:
+    payload = json.loads(response)
+    return {
+        "is_even": payload["value"] % 2 == 0,
+        "checked_in_worker": os.getpid() != payload["pid"],
+    }
+
+
+def test_process_workers(monkeypatch):
+    monkeypatch.setenv("CAT_AI_PROCESS_WORKERS", "3")
+    assert ProcessPoolRunner.get_process_workers() == 3
+
+    monkeypatch.delenv("CAT_AI_PROCESS_WORKERS")
+    assert ProcessPoolRunner.get_process_workers() == (os.cpu_count() or 1)
+
+
+def test_run_multiple_validates_in_worker_processes(tmp_path, test_name):
+    reporter = Reporter(test_name=test_name, output_dir=str(tmp_path), unique_id="processes")
+    runner = ProcessPoolRunner(
+        generate=lambda run_number: json.dumps({"value": run_number, "pid": os.getpid()}),
+        check=check_in_worker,
+        reporter=reporter,
+        max_workers=3,
+        process_workers=2,
+    )
+
+    results = runner.run_multiple(sample_size=6)
+
+    assert results == [True, False, True, False, True, False]
+    assert sorted(os.listdir(reporter.folder_path)) == sorted(
+        ["metadata.json", "validation_summary.csv", "validation_summary.md"]
+        + [f"{'fail' if i % 2 else 'pass'}-{i}.json" for i in range(6)]
+    )
+    with open(os.path.join(reporter.folder_path, "fail-1.json")) as file:
+        assert json.load(file)["validations"] == {"is_even": False, "checked_in_worker": True}
+
+
+def test_workers_are_not_forked():
+    assert _worker_context().get_start_method() in ("forkserver", "spawn")
@@ -0,0 +1,97 @@
+import multiprocessing
+
+import pytest
+
+from cat_ai import rate_limiter as rate_limiter_module
+from cat_ai.rate_limiter import RateLimiter, get_rate_limiter, set_rate_limiter
+from cat_ai.runner import Runner
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def reset_shared_limiter(monkeypatch):
+    monkeypatch.setattr(rate_limiter_module, "_shared_limiter", None)
+    monkeypatch.setattr(rate_limiter_module, "_shared_limiter_loaded", False)
+
+
+def test_requests_per_minute_refill_over_time(clock):
+    limiter = RateLimiter(requests_per_minute=2, clock=clock)
+
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == pytest.approx(30.0)
+
+    clock.now += 30
+    assert limiter.reserve() == 0
+
+
+def test_tokens_per_minute_hold_back_the_request_as_well(clock):
+    limiter = RateLimiter(requests_per_minute=10, tokens_per_minute=1000, clock=clock)
+
+    assert limiter.reserve(tokens=800) == 0
+    assert limiter.reserve(tokens=400) == pytest.approx(12.0)
+
+    clock.now += 12
+    assert limiter.reserve(tokens=400) == 0
+    assert limiter.reserve(tokens=300) == pytest.approx(18.0)
+
+
+def test_reserving_more_than_the_limit_fails(clock):
+    limiter = RateLimiter(tokens_per_minute=100, clock=clock)
+
+    with pytest.raises(ValueError):
+        limiter.reserve(tokens=101)
+
+
+def _reserve_from_shared_file(state_path: str) -> float:
+    return RateLimiter(requests_per_minute=1, state_path=state_path, clock=lambda: 1000.0).reserve()
+
+
+def test_state_file_shares_the_budget_between_processes(tmp_path):
+    state_path = str(tmp_path / "rate-limit.json")
+
+    with multiprocessing.get_context("spawn").Pool(2) as pool:
+        waits = pool.map(_reserve_from_shared_file, [state_path, state_path])
+
+    assert sorted(waits) == [0, 60.0]
+
+
+def test_shared_limiter_from_env(monkeypatch, reset_shared_limiter):
+    monkeypatch.setenv("CAT_AI_REQUESTS_PER_MINUTE", "60")
+    monkeypatch.setenv("CAT_AI_TOKENS_PER_MINUTE", "5000")
+
+    limiter = get_rate_limiter()
+
+    assert limiter is not None
+    assert limiter.requests_per_minute == 60
+    assert limiter.tokens_per_minute == 5000
+    assert get_rate_limiter() is limiter
+
+
+def test_no_shared_limiter_without_env(monkeypatch, reset_shared_limiter):
+    monkeypatch.delenv("CAT_AI_REQUESTS_PER_MINUTE", raising=False)
+    monkeypatch.delenv("CAT_AI_TOKENS_PER_MINUTE", raising=False)
+
+    assert get_rate_limiter() is None
+
+
+def test_runner_acquires_from_shared_limiter(tmp_reporter, clock, reset_shared_limiter):
+    limiter = RateLimiter(requests_per_minute=3, tokens_per_minute=1000, clock=clock)
+    set_rate_limiter(limiter)
+    runner = Runner(test_function=lambda _: True, reporter=tmp_reporter, tokens_per_run=100)
+
+    runner.run_multiple(sample_size=3)
+
+    assert limiter.reserve() == pytest.approx(20.0)
@@ -1,11 +1,15 @@
+import csv
 import json
 import os
-import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Callable
 
+import pytest
+
 from cat_ai.helpers.helpers import root_dir
 from cat_ai.reporter import Reporter
+from cat_ai.statistical_analysis import StatisticalAnalysis
 
 
 def test_reporter_creates_a_unique_folder_path(reporter_factory: Callable) -> None:
@@ -13,11 +17,37 @@ def test_reporter_creates_a_unique_folder_path(reporter_factory: Callable) -> No
     expected_dir_path = f"{root_dir()}/test_runs/test_reporter_creates_a_unique_folder_path"
     assert expected_dir_path in reporter1.folder_path
 
-    time.sleep(2)
     reporter2 = reporter_factory()
     assert str(reporter1.folder_path) != str(reporter2.folder_path)
 
 
+def test_reporters_created_concurrently_get_their_own_folders(tmp_path: Path) -> None:
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        reporters = list(
+            executor.map(
+                lambda _: Reporter(test_name="burst", output_dir=str(tmp_path)), range(200)
+            )
+        )
+
+    folder_paths = [reporter.folder_path for reporter in reporters]
+    assert len(set(folder_paths)) == 200
+    assert len(os.listdir(tmp_path / "test_runs")) == 200
+
+
+def test_unique_ids_name_the_worker_and_sequence() -> None:
+    unique_ids = [Reporter._create_unique_id_from_time() for _ in range(3)]
+    worker = os.getenv("PYTEST_XDIST_WORKER") or f"p{os.getpid()}"
+
+    assert all(f"-{worker}-" in unique_id for unique_id in unique_ids)
+    sequences = [int(unique_id.rsplit("-", 1)[1]) for unique_id in unique_ids]
+    assert sequences == sorted(sequences) and len(set(sequences)) == 3
+
+
+def test_unique_ids_use_the_xdist_worker(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw3")
+    assert "-gw3-" in Reporter._create_unique_id_from_time()
+
+
 def test_reporter_can_accept_unique_id_override(reporter_factory: Callable) -> None:
     unique_id = "timestamp_or_any_unique_id"
     reporter = reporter_factory(unique_id=unique_id)
@@ -77,3 +107,61 @@ def test_format_summary_with_failure_analysis(analyze_failure_rate: Callable) ->
         "> - Standard Error: 0.0237\n"
         "> - Margin of Error: 0.0391\n"
     )
+
+
+def test_close_writes_per_validation_summary(tmp_path: Path, test_name: str) -> None:
+    with Reporter(test_name, str(tmp_path)) as reporter:
+        for run_number in range(20):
+            reporter.for_run(run_number).report(
+                "response",
+                {"valid_json_returned": run_number % 10 != 0, "correct_developer": run_number < 15},
+            )
+
+    analyses = reporter.validation_analyses()
+    assert list(analyses) == ["valid_json_returned", "correct_developer"]
+    assert (
+        analyses["valid_json_returned"].observation,
+        analyses["correct_developer"].observation,
+    ) == (2, 5)
+
+    folder = Path(reporter.folder_path)
+    markdown = (folder / "validation_summary.md").read_text()
+    assert markdown.startswith(
+        f"## {test_name} validations\n\n### valid_json_returned\n\n"
+        + Reporter.format_summary(analyses["valid_json_returned"])
+    )
+    assert (
+        "### correct_developer\n\n" + Reporter.format_summary(analyses["correct_developer"])
+        in markdown
+    )
+
+    with open(folder / "validation_summary.csv", newline="") as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == ["validation", *StatisticalAnalysis.get_csv_headers()]
+    assert rows[1] == [
+        "valid_json_returned",
+        *map(str, analyses["valid_json_returned"].as_csv_row()),
+    ]
+    assert [row[0] for row in rows[1:]] == ["valid_json_returned", "correct_developer"]
+
+
+def test_close_without_reports_writes_no_summary(tmp_path: Path, test_name: str) -> None:
+    with Reporter(test_name, str(tmp_path)) as reporter:
+        pass
+
+    assert os.listdir(reporter.folder_path) == []
+
+
+def test_sharded_reporters_keep_their_own_summary(
+    tmp_path: Path, test_name: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("CAT_AI_SHARD", "2/3")
+    with Reporter(test_name, str(tmp_path), unique_id="shared") as reporter:
+        reporter.report("response", {"valid_json_returned": True})
+
+    assert sorted(os.listdir(reporter.folder_path)) == [
+        "metadata.json",
+        "pass-0.json",
+        "validation_summary-shard-2-of-3.csv",
+        "validation_summary-shard-2-of-3.md",
+    ]
@@ -0,0 +1,99 @@
+from functools import partial
+from typing import Callable, Sequence
+
+import pytest
+
+from cat_ai.batch_runner import BatchRunner
+from cat_ai.reporter import Reporter
+from cat_ai.response_cache import CacheMiss, ResponseCache
+from cat_ai.runner import Runner
+
+REQUEST = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "Hi"}], "n": 1}
+
+
+def test_request_key_ignores_key_order():
+    reordered = {"n": 1, "messages": [{"content": "Hi", "role": "user"}], "model": "gpt-4o-mini"}
+    assert ResponseCache.request_key(REQUEST) == ResponseCache.request_key(reordered)
+    assert ResponseCache.request_key(REQUEST) != ResponseCache.request_key({**REQUEST, "n": 2})
+
+
+def test_cache_mode_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("CAT_AI_CACHE_MODE", "replay")
+    assert ResponseCache(str(tmp_path)).mode == "replay"
+
+    monkeypatch.delenv("CAT_AI_CACHE_MODE")
+    assert ResponseCache(str(tmp_path)).mode == "record"
+
+    with pytest.raises(ValueError):
+        ResponseCache(str(tmp_path), mode="rewind")
+
+
+def test_replay_returns_recorded_response_per_run(tmp_path):
+    recorder = ResponseCache(str(tmp_path), mode="record")
+    for run_number in range(3):
+        recorder.fetch(REQUEST, run_number, partial("response {}".format, run_number))
+
+    replay = ResponseCache(str(tmp_path), mode="replay")
+
+    assert replay.fetch(REQUEST, 2, lambda: pytest.fail("replay must not generate")) == (
+        "response 2"
+    )
+    with pytest.raises(CacheMiss):
+        replay.fetch(REQUEST, 3, lambda: "never")
+    with pytest.raises(CacheMiss):
+        replay.fetch({**REQUEST, "temperature": 0}, 0, lambda: "never")
+
+
+@pytest.mark.parametrize("mode, generated", [("auto", ["new 1"]), ("off", ["new 0", "new 1"])])
+def test_generates_missing_responses(tmp_path, mode, generated):
+    ResponseCache(str(tmp_path), mode="record").fetch(REQUEST, 0, lambda: "recorded 0")
+    cache = ResponseCache(str(tmp_path), mode=mode)
+    calls = []
+
+    def generate(run_number: int) -> str:
+        calls.append(f"new {run_number}")
+        return f"new {run_number}"
+
+    responses = [cache.fetch(REQUEST, n, partial(generate, n)) for n in range(2)]
+
+    assert calls == generated
+    assert responses[1] == "new 1"
+
+
+def test_runner_replays_through_reporter(tmp_path, test_name):
+    reporter = Reporter(test_name=test_name, output_dir=str(tmp_path), unique_id="replay")
+    cache = ResponseCache(str(tmp_path / "cassettes"), mode="record")
+
+    def test_function(run_reporter: Reporter, generate: Callable[[], str]) -> bool:
+        response = cache.fetch(REQUEST, run_reporter.run_number, generate)
+        return run_reporter.report(response, {"is_even": response.endswith("even")})
+
+    Runner(
+        lambda r: test_function(r, lambda: "odd" if r.run_number % 2 else "even"), reporter
+    ).run_multiple(4)
+    cache.mode = "replay"
+
+    replayed = Runner(lambda r: test_function(r, lambda: pytest.fail()), reporter).run_multiple(4)
+
+    assert replayed == [True, False, True, False]
+
+
+def test_batch_runner_replays_recorded_batches(tmp_path, tmp_reporter):
+    cache = ResponseCache(str(tmp_path), mode="record")
+    counter = iter(range(100))
+
+    def runner(generate: Callable[[int], Sequence[str]]) -> BatchRunner:
+        return BatchRunner(
+            generate=generate,
+            validate=lambda reporter, response: int(response) == reporter.run_number,
+            reporter=tmp_reporter,
+            max_generations=2,
+            cache=cache,
+            cache_request=REQUEST,
+        )
+
+    recorded = runner(lambda n: [str(next(counter)) for _ in range(n)]).run_multiple(5)
+    cache.mode = "replay"
+    replayed = runner(lambda n: pytest.fail("replay must not generate")).run_multiple(5)
+
+    assert recorded == replayed
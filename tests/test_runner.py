@@ -1,6 +1,13 @@
+import os
+import threading
+import time
+
 import pytest
 
+from cat_ai.rate_limiter import RateLimiter
+from cat_ai.reporter import Reporter
 from cat_ai.runner import Runner
+from cat_ai.sinks import ObjectStoreSink
 
 
 def test_runner_sample_size(monkeypatch):
@@ -49,3 +56,277 @@ def test_run_with_env_variable(monkeypatch, tmp_reporter, sample_size):
     assert len(results) == sample_size
     expected_results = [True] * sample_size
     assert results == expected_results
+
+
+def test_runner_concurrency(monkeypatch):
+    monkeypatch.setenv("CAT_AI_CONCURRENCY", "4")
+    assert Runner.get_concurrency() == 4
+
+    monkeypatch.delenv("CAT_AI_CONCURRENCY", raising=False)
+    assert Runner.get_concurrency(default_workers=2) == 2
+
+
+def test_run_multiple_concurrently_keeps_run_order(tmp_path, test_name):
+    reporter = Reporter(test_name=test_name, output_dir=str(tmp_path), unique_id="concurrent")
+
+    def slow_when_even(run_reporter: Reporter) -> bool:
+        if run_reporter.run_number % 2 == 0:
+            time.sleep(0.01)
+        return run_reporter.report(
+            str(run_reporter.run_number), {"odd": run_reporter.run_number % 2 == 1}
+        )
+
+    runner = Runner(test_function=slow_when_even, reporter=reporter, max_workers=4)
+
+    results = runner.run_multiple(sample_size=8)
+
+    assert results == [i % 2 == 1 for i in range(8)]
+    assert sorted(os.listdir(reporter.folder_path)) == sorted(
+        ["metadata.json", "validation_summary.csv", "validation_summary.md"]
+        + [f"{'pass' if i % 2 else 'fail'}-{i}.json" for i in range(8)]
+    )
+    assert reporter.run_number == 0
+
+
+def test_run_multiple_writes_the_validation_summary(tmp_path, test_name):
+    reporter = Reporter(test_name=test_name, output_dir=str(tmp_path), unique_id="summary")
+
+    def validate(run_reporter: Reporter) -> bool:
+        run_number = run_reporter.run_number
+        return run_reporter.report(
+            "response", {"odd": run_number % 2 == 1, "small": run_number < 8}
+        )
+
+    Runner(test_function=validate, reporter=reporter, max_workers=2).run_multiple(sample_size=10)
+
+    with open(os.path.join(reporter.folder_path, "validation_summary.csv")) as file:
+        rows = [line.split(",")[:3] for line in file.read().splitlines()]
+    assert rows == [
+        ["validation", "failure_count", "sample_size"],
+        ["odd", "5", "10"],
+        ["small", "2", "10"],
+    ]
+    with open(os.path.join(reporter.folder_path, "validation_summary.md")) as file:
+        assert "### odd\n\n> [!NOTE]\n> ## 5 ± " in file.read()
+
+
+@pytest.mark.parametrize(
+    "success_every, expected_runs",
+    [(1, 30), (2, 10)],
+)
+def test_run_sequential_stops_once_settled(tmp_reporter, success_every, expected_runs):
+    runner = Runner(
+        test_function=lambda reporter: reporter.run_number % success_every == 0,
+        reporter=tmp_reporter,
+    )
+
+    results = runner.run_sequential(expected_success_rate=0.9, max_sample_size=100, batch_size=10)
+
+    assert len(results) == expected_runs
+    assert results == [i % success_every == 0 for i in range(expected_runs)]
+
+
+def test_run_sequential_stops_at_max_sample_size(tmp_reporter):
+    runner = Runner(
+        test_function=lambda reporter: reporter.run_number % 10 != 0, reporter=tmp_reporter
+    )
+
+    results = runner.run_sequential(expected_success_rate=0.9, max_sample_size=15, batch_size=4)
+
+    assert len(results) == 15
+
+
+def test_plan_sample_size(monkeypatch):
+    monkeypatch.delenv("CAT_AI_SAMPLE_SIZE", raising=False)
+    monkeypatch.delenv("CAT_AI_CONFIDENCE_LEVEL", raising=False)
+    assert Runner.plan_sample_size(expected_success_rate=0.9, margin_of_error=0.1) == 25
+
+    monkeypatch.setenv("CAT_AI_SAMPLE_SIZE", "7")
+    assert Runner.plan_sample_size(expected_success_rate=0.9, margin_of_error=0.1) == 7
+
+
+def test_plan_sample_size_at_the_configured_confidence_level(monkeypatch):
+    monkeypatch.delenv("CAT_AI_SAMPLE_SIZE", raising=False)
+    monkeypatch.setenv("CAT_AI_CONFIDENCE_LEVEL", "0.99")
+    assert Runner.plan_sample_size(expected_success_rate=0.9, margin_of_error=0.1) == 60
+
+
+def test_runner_deadlines_from_env(monkeypatch, tmp_reporter):
+    monkeypatch.setenv("CAT_AI_RUN_TIMEOUT", "2.5")
+    monkeypatch.setenv("CAT_AI_TIME_BUDGET", "60")
+    runner = Runner(test_function=lambda _: True, reporter=tmp_reporter)
+    assert (runner.timeout, runner.time_budget) == (2.5, 60.0)
+
+    monkeypatch.delenv("CAT_AI_RUN_TIMEOUT")
+    monkeypatch.delenv("CAT_AI_TIME_BUDGET")
+    runner = Runner(test_function=lambda _: True, reporter=tmp_reporter)
+    assert (runner.timeout, runner.time_budget) == (None, None)
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_run_exceeding_timeout_is_recorded_as_timeout(tmp_path, test_name, max_workers):
+    reporter = Reporter(test_name=test_name, output_dir=str(tmp_path), unique_id="timeout")
+    release = threading.Event()
+
+    def hangs_on_second_run(run_reporter: Reporter) -> bool:
+        if run_reporter.run_number == 1:
+            release.wait(5)
+        return run_reporter.report("response", {"ok": True})
+
+    runner = Runner(hangs_on_second_run, reporter, max_workers=max_workers, timeout=0.1)
+
+    results = runner.run_multiple(sample_size=3)
+    release.set()
+
+    assert results == [True, False, True]
+    time.sleep(0.05)
+    assert sorted(os.listdir(reporter.folder_path)) == [
+        "metadata.json",
+        "pass-0.json",
+        "pass-2.json",
+        "timeout-1.json",
+        "validation_summary.csv",
+        "validation_summary.md",
+    ]
+
+
+def test_waiting_for_rate_limit_budget_does_not_count_toward_the_timeout(tmp_path, test_name):
+    reporter = Reporter(test_name, str(tmp_path), unique_id="rate_limited")
+    rate_limiter = RateLimiter(requests_per_minute=300)
+    while rate_limiter.reserve() == 0:
+        pass  # drain the budget, every run then waits 0.2s for its request
+
+    runner = Runner(
+        lambda r: r.report("response", {"ok": True}),
+        reporter,
+        rate_limiter=rate_limiter,
+        timeout=0.1,
+    )
+
+    assert runner.run_multiple(sample_size=3) == [True, True, True]
+    assert not any(name.startswith("timeout-") for name in os.listdir(reporter.folder_path))
+
+
+def test_time_budget_stops_scheduling_runs(tmp_reporter):
+    def slow(_: Reporter) -> bool:
+        time.sleep(0.05)
+        return True
+
+    runner = Runner(slow, tmp_reporter, time_budget=0.12)
+
+    results = runner.run_multiple(sample_size=10)
+
+    assert 2 <= len(results) <= 3
+    assert all(results)
+
+
+def test_runs_abandoned_at_the_time_budget_write_no_report(tmp_path, test_name):
+    reporter = Reporter(test_name, str(tmp_path), unique_id="abandoned")
+    release = threading.Event()
+
+    def hangs_on_second_run(run_reporter: Reporter) -> bool:
+        if run_reporter.run_number == 1:
+            release.wait(5)
+        return run_reporter.report("response", {"ok": True})
+
+    results = Runner(hangs_on_second_run, reporter, time_budget=0.1).run_multiple(sample_size=3)
+    release.set()
+    time.sleep(0.05)
+
+    assert results == [True]
+    assert not any(name.startswith("pass-1") for name in os.listdir(reporter.folder_path))
+
+
+def test_a_run_finishing_at_its_deadline_writes_one_report(tmp_path, test_name):
+    reporter = Reporter(test_name, str(tmp_path), unique_id="deadline")
+    for run_number in range(50):
+        run_reporter = reporter.for_run(run_number)
+        finish = threading.Thread(
+            target=run_reporter.report, args=("response", {"ok": run_number % 2 == 0})
+        )
+        finish.start()
+        timed_out = run_reporter.report_timeout(0.1)
+        finish.join()
+        assert timed_out is (run_number % 2 == 0 and not run_reporter.timed_out)
+
+    run_files = [name for name in os.listdir(reporter.folder_path) if name != "metadata.json"]
+    assert sorted(int(name.split("-")[1].split(".")[0]) for name in run_files) == list(range(50))
+
+
+def test_resume_runs_only_the_missing_run_numbers(tmp_path, test_name):
+    reporter = Reporter(test_name, str(tmp_path), unique_id="interrupted")
+
+    def report_odd_runs_as_passed(run_reporter: Reporter) -> bool:
+        return run_reporter.report("response", {"odd": run_reporter.run_number % 2 == 1})
+
+    Runner(report_odd_runs_as_passed, reporter).run_multiple(sample_size=5)
+
+    executed = []
+
+    def record_run(run_reporter: Reporter) -> bool:
+        executed.append(run_reporter.run_number)
+        return report_odd_runs_as_passed(run_reporter)
+
+    resumed = Reporter(test_name, str(tmp_path), unique_id="interrupted")
+    results = Runner(record_run, resumed, resume=True).run_multiple(sample_size=8)
+
+    assert executed == [5, 6, 7]
+    assert results == [run_number % 2 == 1 for run_number in range(8)]
+
+
+def test_resumed_validation_summary_counts_the_earlier_runs(tmp_path, test_name):
+    def report_odd_runs_as_passed(run_reporter: Reporter) -> bool:
+        return run_reporter.report("response", {"odd": run_reporter.run_number % 2 == 1})
+
+    first = Reporter(test_name, str(tmp_path), unique_id="summary")
+    Runner(report_odd_runs_as_passed, first).run_multiple(sample_size=6)
+
+    resumed = Reporter(test_name, str(tmp_path), unique_id="summary")
+    Runner(report_odd_runs_as_passed, resumed, resume=True).run_multiple(sample_size=8)
+
+    with open(os.path.join(resumed.folder_path, "validation_summary.csv")) as file:
+        rows = [line.split(",")[:3] for line in file.read().splitlines()]
+    assert rows == [["validation", "failure_count", "sample_size"], ["odd", "4", "8"]]
+
+
+@pytest.mark.parametrize("output_format", ["sqlite", "object store"])
+def test_resume_needs_reports_it_can_read(tmp_path, test_name, output_format):
+    if output_format == "sqlite":
+        reporter = Reporter(test_name, str(tmp_path), output_format="sqlite")
+    else:
+        reporter = Reporter(test_name, str(tmp_path), sinks=[ObjectStoreSink(lambda *_: None)])
+    runner = Runner(lambda r: r.report("response", {"ok": True}), reporter, resume=True)
+
+    with pytest.raises(ValueError, match="no sink of the reporter writes them"):
+        runner.run_multiple(sample_size=3)
+
+
+def test_resume_reads_jsonl_written_in_the_background(tmp_path, test_name):
+    with Reporter(test_name, str(tmp_path), output_format="jsonl", background=True) as reporter:
+        assert reporter.writes_run_folder()
+        assert Runner(lambda _: True, reporter, resume=True).completed_runs() == {}
+
+
+def test_resume_after_a_truncated_jsonl_record(tmp_path, test_name):
+    def report_run(run_reporter: Reporter) -> bool:
+        return run_reporter.report("response", {"even": run_reporter.run_number % 2 == 0})
+
+    def resume(sample_size: int) -> list[bool]:
+        with Reporter(test_name, str(tmp_path), unique_id="cut", output_format="jsonl") as reporter:
+            return Runner(report_run, reporter, resume=True).run_multiple(sample_size)
+
+    resume(3)
+    path = tmp_path / "test_runs" / f"{test_name}-cut" / "runs.jsonl"
+    with open(path, "rb+") as file:
+        file.truncate(file.seek(0, os.SEEK_END) - 5)
+
+    assert resume(4) == [True, False, True, False]
+    assert resume(5) == [True, False, True, False, True]
+    assert len(path.read_text().splitlines()) == 5
+
+
+def test_resume_from_env(monkeypatch, tmp_reporter):
+    monkeypatch.setenv("CAT_AI_RESUME", "1")
+    assert Runner(lambda _: True, tmp_reporter).resume
+    monkeypatch.delenv("CAT_AI_RESUME")
+    assert not Runner(lambda _: True, tmp_reporter).resume
@@ -0,0 +1,110 @@
+import asyncio
+import os
+
+import pytest
+
+from cat_ai.async_runner import AsyncRunner
+from cat_ai.batch_runner import BatchRunner
+from cat_ai.process_runner import ProcessPoolRunner
+from cat_ai.reporter import Reporter
+from cat_ai.runner import Runner
+from cat_ai.shards import Shard, collect_run_outcomes, merge_shard_results
+
+
+@pytest.mark.parametrize(
+    "spec, run_numbers",
+    [("1/1", [0, 1, 2, 3, 4, 5, 6]), ("1/3", [0, 3, 6]), ("3/3", [2, 5])],
+)
+def test_shard_run_numbers(spec, run_numbers):
+    assert list(Shard.parse(spec).run_numbers(7)) == run_numbers
+
+
+@pytest.mark.parametrize("spec", ["0/2", "3/2"])
+def test_shard_index_must_be_within_count(spec):
+    with pytest.raises(ValueError):
+        Shard.parse(spec)
+
+
+def test_shard_from_env(monkeypatch):
+    monkeypatch.delenv("CAT_AI_SHARD", raising=False)
+    assert Shard.from_env() is None
+
+    monkeypatch.setenv("CAT_AI_SHARD", "2/8")
+    assert Shard.from_env() == Shard(index=2, count=8)
+
+    monkeypatch.setenv("CAT_AI_SHARD", "xdist")
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw3")
+    monkeypatch.setenv("PYTEST_XDIST_WORKER_COUNT", "4")
+    assert Shard.from_env() == Shard(index=4, count=4)
+
+
+def test_shards_share_folder_and_merge(monkeypatch, tmp_path, test_name):
+    monkeypatch.setenv("CAT_AI_RUN_ID", "ci-1234")
+    monkeypatch.delenv("CAT_AI_SHARD", raising=False)
+
+    for index in (1, 2, 3):
+        reporter = Reporter(test_name=test_name, output_dir=str(tmp_path))
+        runner = Runner(
+            lambda r: r.report("response", {"ok": r.run_number % 4 != 0}),
+            reporter,
+            shard=Shard(index=index, count=3),
+        )
+        assert len(runner.run_multiple(sample_size=10)) == len(range(index - 1, 10, 3))
+        reporter.close()
+
+    outcomes = collect_run_outcomes(reporter.folder_path)
+    assert sorted(outcomes) == list(range(10))
+
+    analysis = merge_shard_results(reporter.folder_path)
+    assert (analysis.observation, analysis.sample_size) == (3, 10)
+    assert sorted(
+        name for name in os.listdir(reporter.folder_path) if name.startswith("validation_summary")
+    ) == [
+        f"validation_summary-shard-{index}-of-3.{ext}"
+        for index in (1, 2, 3)
+        for ext in ("csv", "md")
+    ]
+
+
+def check_response(response: str) -> dict[str, bool]:
+    return {"ok": bool(response)}
+
+
+async def report_async(run_reporter: Reporter) -> bool:
+    return await run_reporter.areport("response", {"ok": True})
+
+
+@pytest.mark.parametrize("runner_type", ["batch", "async", "process"])
+def test_every_runner_executes_only_its_shard(monkeypatch, tmp_path, test_name, runner_type):
+    monkeypatch.setenv("CAT_AI_SHARD", "2/3")
+    reporter = Reporter(test_name=test_name, output_dir=str(tmp_path), unique_id=runner_type)
+
+    if runner_type == "batch":
+        BatchRunner(
+            generate=lambda n: ["response"] * n,
+            validate=lambda r, response: r.report(response, {"ok": True}),
+            reporter=reporter,
+            max_generations=2,
+        ).run_multiple(sample_size=10)
+    elif runner_type == "async":
+        asyncio.run(AsyncRunner(report_async, reporter).run_multiple(sample_size=10))
+    else:
+        ProcessPoolRunner(
+            generate=str, check=check_response, reporter=reporter, process_workers=1
+        ).run_multiple(sample_size=10)
+
+    run_files = sorted(f for f in os.listdir(reporter.folder_path) if f.startswith("pass-"))
+    assert run_files == ["pass-1.json", "pass-4.json", "pass-7.json"]
+    assert sorted(collect_run_outcomes(reporter.folder_path)) == [1, 4, 7]
+
+
+def test_run_sequential_refuses_a_shard(tmp_reporter):
+    runner = Runner(lambda r: True, tmp_reporter, shard=Shard(index=1, count=2))
+
+    with pytest.raises(ValueError, match="run_sequential cannot run shard 1/2"):
+        runner.run_sequential(expected_success_rate=0.9, max_sample_size=10)
+
+
+def test_merge_without_reports_fails(tmp_path):
+    with pytest.raises(ValueError):
+        merge_shard_results(str(tmp_path))
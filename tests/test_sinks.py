@@ -0,0 +1,281 @@
+import json
+import os
+import threading
+from typing import Optional
+
+import pytest
+
+from cat_ai import sinks
+from cat_ai.reporter import Reporter
+from cat_ai.sinks import (
+    BackgroundSink,
+    FileSink,
+    JsonlSink,
+    ObjectStoreSink,
+    ReportSink,
+    dumps_record,
+    read_run_records,
+    recover_run_folder,
+    run_outcome,
+)
+
+
+def report_runs(reporter: Reporter) -> None:
+    for run_number in range(3):
+        reporter.for_run(run_number).report(f"response {run_number}", {"odd": run_number % 2 == 1})
+
+
+def test_jsonl_sink_appends_compact_lines(tmp_path):
+    path = str(tmp_path / "runs.jsonl")
+    sink = JsonlSink(path)
+
+    sink.write({"a": 1, "b": [1, 2]})
+    sink.write({"a": 2})
+    sink.close()
+
+    with open(path) as file:
+        assert file.read() == '{"a":1,"b":[1,2]}\n{"a":2}\n'
+
+
+def test_jsonl_records_match_per_file_records(tmp_path, test_name):
+    per_file = Reporter(test_name, str(tmp_path), unique_id="same", output_format="json")
+    report_runs(per_file)
+    per_file_records = list(read_run_records(per_file.folder_path))
+    for record in per_file_records:
+        os.remove(os.path.join(per_file.folder_path, record["output_file"]))
+
+    with Reporter(test_name, str(tmp_path), unique_id="same", output_format="jsonl") as jsonl:
+        report_runs(jsonl)
+
+    assert sorted(os.listdir(jsonl.folder_path)) == [
+        "metadata.json",
+        "runs.jsonl",
+        "validation_summary.csv",
+        "validation_summary.md",
+    ]
+    assert list(read_run_records(jsonl.folder_path)) == per_file_records
+    assert [run_outcome(record) for record in per_file_records] == [
+        (0, False),
+        (1, True),
+        (2, False),
+    ]
+
+
+def test_read_run_records_skips_truncated_last_line(tmp_path):
+    with open(tmp_path / "runs.jsonl", "w") as file:
+        file.write(json.dumps({"output_file": "pass-0.json"}) + "\n")
+        file.write('{"output_file": "fail-1.js')
+
+    assert list(read_run_records(str(tmp_path))) == [{"output_file": "pass-0.json"}]
+
+
+def test_read_run_records_fails_on_corrupt_complete_line(tmp_path):
+    with open(tmp_path / "runs.jsonl", "w") as file:
+        file.write("not json\n")
+
+    with pytest.raises(json.JSONDecodeError):
+        list(read_run_records(str(tmp_path)))
+
+
+def test_reporter_output_format_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("CAT_AI_REPORT_FORMAT", "jsonl")
+    with Reporter("env_format", str(tmp_path)) as reporter:
+        assert reporter.output_format == "jsonl"
+
+    with pytest.raises(ValueError):
+        Reporter("unknown_format", str(tmp_path), output_format="xml")
+
+
+def test_sink_without_write_fails_when_constructed():
+    class IncompleteSink(ReportSink):
+        def close(self) -> None:
+            pass
+
+    with pytest.raises(TypeError, match="abstract method"):
+        IncompleteSink()  # type: ignore[abstract]
+
+
+class ListSink(ReportSink):
+    def __init__(self, release: Optional[threading.Event] = None) -> None:
+        self.records: list[dict] = []
+        self.closed = False
+        self.release = release
+
+    def write(self, record: dict) -> None:
+        if self.release:
+            self.release.wait(5)
+        self.records.append(record)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_stdout_echo_is_opt_in(monkeypatch, tmp_path, capsys):
+    monkeypatch.delenv("CAT_AI_REPORT_STDOUT", raising=False)
+    Reporter("quiet", str(tmp_path)).report("response", {"ok": True})
+    assert capsys.readouterr().out == ""
+
+    monkeypatch.setenv("CAT_AI_REPORT_STDOUT", "1")
+    Reporter("echo", str(tmp_path)).report("response", {"ok": True})
+    assert json.loads(capsys.readouterr().out)["output_file"] == "pass-0.json"
+
+
+def test_background_sink_returns_before_the_record_is_written(tmp_path):
+    release = threading.Event()
+    target = ListSink(release)
+    reporter = Reporter("background", str(tmp_path), sinks=[target], background=True)
+
+    reporter.report("response", {"ok": True})
+    assert target.records == []
+
+    release.set()
+    reporter.close()
+    assert [record["output_file"] for record in target.records] == ["pass-0.json"]
+    assert target.closed
+
+
+def test_background_sink_raises_writer_error_on_close():
+    class FailingSink(ReportSink):
+        def write(self, record: dict) -> None:
+            raise OSError("disk full")
+
+    sink = BackgroundSink(FailingSink())
+    sink.write({"output_file": "pass-0.json"})
+
+    with pytest.raises(OSError, match="disk full"):
+        sink.close()
+
+
+def test_object_store_sink_puts_one_object_per_run(tmp_path):
+    objects = {}
+    reporter = Reporter(
+        "object_store",
+        str(tmp_path),
+        unique_id="42",
+        sinks=[ObjectStoreSink(lambda key, body: objects.update({key: body}), prefix="runs/")],
+    )
+
+    reporter.for_run(3).report("response", {"ok": False})
+
+    assert list(objects) == ["runs/object_store-42/fail-3.json"]
+    assert json.loads(objects["runs/object_store-42/fail-3.json"])["response"] == "response"
+
+
+@pytest.mark.parametrize(
+    "durability, expected_fsyncs",
+    # batch: two files and their folder once the batch is full, then one file and the folder
+    # record: every file and the folder after each write
+    [("none", 0), ("batch", 3 + 2), ("record", 3 * 2)],
+)
+def test_durability_policy_decides_when_run_files_are_synced(
+    monkeypatch, tmp_path, durability, expected_fsyncs
+):
+    synced: list[int] = []
+    monkeypatch.setattr(os, "fsync", synced.append)
+    sink = FileSink(str(tmp_path), durability=durability, batch_size=2)
+
+    for run_number in range(3):
+        sink.write({"output_file": f"pass-{run_number}.json"})
+    sink.flush()
+
+    assert len(synced) == expected_fsyncs
+    assert sorted(os.listdir(tmp_path)) == ["pass-0.json", "pass-1.json", "pass-2.json"]
+
+
+def test_jsonl_sink_syncs_every_record(monkeypatch, tmp_path):
+    synced: list[int] = []
+    monkeypatch.setattr(os, "fsync", synced.append)
+    sink = JsonlSink(str(tmp_path / "runs.jsonl"), durability="record")
+
+    sink.write({"a": 1})
+    sink.write({"a": 2})
+    sink.close()
+
+    assert len(synced) == 2
+
+
+def test_unknown_durability_policy_is_rejected(tmp_path, test_name):
+    with pytest.raises(ValueError, match="durability"):
+        Reporter(test_name, str(tmp_path), durability="sometimes")
+
+
+def test_recover_run_folder_repairs_partial_files(tmp_path):
+    (tmp_path / "pass-0.json").write_text(json.dumps({"output_file": "pass-0.json"}))
+    (tmp_path / "fail-1.json").write_text('{"output_file": "fa')
+    (tmp_path / "pass-2.json.123-456.tmp").write_text("{")
+    (tmp_path / "runs.jsonl").write_text('{"output_file": "pass-3.json"}\n{"outp')
+
+    recovered = recover_run_folder(str(tmp_path))
+
+    assert sorted(os.path.basename(path) for path in recovered) == [
+        "fail-1.json",
+        "pass-2.json.123-456.tmp",
+        "runs.jsonl",
+    ]
+    assert sorted(os.listdir(tmp_path)) == ["fail-1.json.partial", "pass-0.json", "runs.jsonl"]
+    assert (tmp_path / "runs.jsonl").read_text() == '{"output_file": "pass-3.json"}\n'
+    assert [run_outcome(record) for record in read_run_records(str(tmp_path))] == [
+        (0, True),
+        (3, True),
+    ]
+    assert recover_run_folder(str(tmp_path)) == []
+
+
+def test_read_run_records_skips_partially_written_run_file(tmp_path):
+    (tmp_path / "pass-0.json").write_text(json.dumps({"output_file": "pass-0.json"}))
+    (tmp_path / "pass-1.json").write_text("")
+
+    assert list(read_run_records(str(tmp_path))) == [{"output_file": "pass-0.json"}]
+
+
+def test_compact_reporter_writes_single_line_run_files(tmp_path, test_name):
+    with Reporter(test_name, str(tmp_path), unique_id="pretty") as pretty:
+        report_runs(pretty)
+    with Reporter(test_name, str(tmp_path), unique_id="compact", compact=True) as compact:
+        report_runs(compact)
+
+    with open(os.path.join(compact.folder_path, "pass-1.json")) as file:
+        assert "\n" not in file.read()
+    assert [
+        (record["output_file"], record["response"], record["validations"])
+        for record in read_run_records(compact.folder_path)
+    ] == [
+        (record["output_file"], record["response"], record["validations"])
+        for record in read_run_records(pretty.folder_path)
+    ]
+
+
+COMPACT_RECORD = {"response": "Équipe 🚀", "validations": {"ok": True}, "n": 1.5}
+COMPACT_TEXT = '{"response":"Équipe 🚀","validations":{"ok":true},"n":1.5}'
+
+
+def test_compact_records_use_the_fast_encoder(monkeypatch):
+    encoded = []
+
+    def fake_fast_dumps(record):
+        encoded.append(record)
+        return json.dumps(record, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    monkeypatch.setattr(sinks, "_installed_fast_dumps", fake_fast_dumps)
+    assert sinks.use_fast_encoder() == "orjson"
+    try:
+        assert dumps_record(COMPACT_RECORD, compact=True) == COMPACT_TEXT
+        assert encoded == [COMPACT_RECORD]
+    finally:
+        sinks.use_fast_encoder()
+
+
+def test_compact_records_without_the_fast_encoder():
+    assert sinks.use_fast_encoder(False) == "json"
+    try:
+        assert dumps_record(COMPACT_RECORD, compact=True) == COMPACT_TEXT
+        assert json.loads(dumps_record(COMPACT_RECORD)) == COMPACT_RECORD
+    finally:
+        sinks.use_fast_encoder()
+
+
+def test_compact_records_are_the_same_with_orjson():
+    pytest.importorskip("orjson")
+    assert sinks.use_fast_encoder() == "orjson"
+
+    assert dumps_record(COMPACT_RECORD, compact=True) == COMPACT_TEXT
@@ -0,0 +1,83 @@
+import json
+import sqlite3
+
+import pytest
+
+from cat_ai.reporter import Reporter
+from cat_ai.sqlite_store import SQLITE_FILE_NAME, SqliteSink, validation_failure_analysis
+
+
+def report_ci_run(output_dir: str, unique_id: str, hallucinations: int) -> Reporter:
+    with Reporter(
+        "test_allocations",
+        output_dir,
+        unique_id=unique_id,
+        metadata={"ai-model": "champion-1"},
+        output_format="sqlite",
+    ) as reporter:
+        for run_number in range(10):
+            reporter.for_run(run_number).report(
+                json.dumps({"developers": []}),
+                {
+                    "no_developer_name_is_hallucinated": run_number >= hallucinations,
+                    "valid_json_returned": True,
+                },
+            )
+    return reporter
+
+
+def test_sqlite_sink_stores_normalized_runs(tmp_path):
+    reporter = report_ci_run(str(tmp_path), "ci-1", hallucinations=2)
+
+    connection = sqlite3.connect(tmp_path / "test_runs" / SQLITE_FILE_NAME)
+    assert connection.execute("SELECT run_id, metadata FROM test_runs").fetchall() == [
+        ("test_allocations-ci-1", '{\n    "ai-model": "champion-1"\n}')
+    ]
+    assert connection.execute("SELECT COUNT(*) FROM responses").fetchone() == (1,)
+    assert connection.execute(
+        "SELECT outcome, COUNT(*) FROM runs GROUP BY outcome ORDER BY outcome"
+    ).fetchall() == [("fail", 2), ("pass", 8)]
+    assert connection.execute("SELECT COUNT(*) FROM validations").fetchone() == (20,)
+    assert reporter.output_format == "sqlite"
+
+
+def test_sqlite_sink_commits_in_batches(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    sink = SqliteSink(path, batch_size=2)
+    reporter = Reporter("batched", str(tmp_path), unique_id="1", sinks=[sink])
+
+    def stored_runs() -> int:
+        count: int = sqlite3.connect(path).execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+        return count
+
+    reporter.report("response", {"ok": True})
+    assert stored_runs() == 0
+    reporter.for_run(1).report("response", {"ok": True})
+    assert stored_runs() == 2
+    reporter.for_run(2).report("response", {"ok": True})
+    reporter.close()
+    assert stored_runs() == 3
+
+
+def test_validation_failure_analysis_over_last_runs(tmp_path):
+    for ci_run, hallucinations in enumerate([9, 1, 2, 3]):
+        report_ci_run(str(tmp_path), f"ci-{ci_run}", hallucinations)
+    path = str(tmp_path / "test_runs" / SQLITE_FILE_NAME)
+
+    analysis = validation_failure_analysis(path, "no_developer_name_is_hallucinated", last_runs=3)
+
+    assert (analysis.observation, analysis.sample_size) == (6, 30)
+    with pytest.raises(ValueError):
+        validation_failure_analysis(path, "unknown_validation")
+
+
+def test_reported_again_runs_replace_their_rows(tmp_path):
+    report_ci_run(str(tmp_path), "resumed", hallucinations=10)
+    report_ci_run(str(tmp_path), "resumed", hallucinations=2)
+    path = str(tmp_path / "test_runs" / SQLITE_FILE_NAME)
+
+    connection = sqlite3.connect(path)
+    assert connection.execute("SELECT COUNT(*) FROM runs").fetchone() == (10,)
+    assert connection.execute("SELECT COUNT(*) FROM validations").fetchone() == (20,)
+    analysis = validation_failure_analysis(path, "no_developer_name_is_hallucinated")
+    assert (analysis.observation, analysis.sample_size) == (2, 10)
@@ -1,11 +1,24 @@
 import io
 import math
+import pickle
 from statistics import NormalDist
 
 import matplotlib.pyplot as plt
 import numpy as np
 import pytest
 
+from cat_ai.statistical_analysis import (
+    SampleAccumulator,
+    StatisticalAnalysis,
+    analyse_measure_from_test_sample,
+    analyse_measures_from_test_samples,
+    analysis_columns,
+    confidence_interval,
+    get_confidence_level,
+    required_sample_size,
+    sequential_decision,
+    z_score,
+)
 from tests.conftest import export_results_to_csv, running_in_ci
 
 
@@ -205,3 +218,242 @@ def test_failure_rate_graph(snapshot, analyze_failure_rate, configure_matplotlib
 
     # Compare with snapshot
     snapshot.assert_match(buf.read(), "failure_rate_graph.png")
+
+
+@pytest.mark.parametrize(
+    "successes, total, expected_success_rate, decision",
+    [
+        (26, 26, 0.9, None),
+        (27, 27, 0.9, True),
+        (20, 25, 0.9, False),
+        (90, 100, 0.9, None),
+        (0, 1, 0.99, None),
+        (5, 10, 0.99, False),
+    ],
+)
+def test_sequential_decision(successes, total, expected_success_rate, decision):
+    assert sequential_decision(successes, total, expected_success_rate) is decision
+
+
+@pytest.mark.parametrize("expected_success_rate", [0.0, 1.0])
+def test_sequential_decision_needs_uncertain_expectation(expected_success_rate):
+    with pytest.raises(ValueError):
+        sequential_decision(1, 1, expected_success_rate)
+
+
+@pytest.mark.parametrize(
+    "expected_success_rate, margin_of_error, confidence_level, sample_size",
+    [
+        (0.5, 0.05, 0.90, 271),
+        (0.9, 0.05, 0.90, 98),
+        (0.9, 0.05, 0.95, 139),
+        (0.9, 0.1, 0.90, 25),
+    ],
+)
+def test_required_sample_size(
+    expected_success_rate, margin_of_error, confidence_level, sample_size
+):
+    assert (
+        required_sample_size(expected_success_rate, margin_of_error, confidence_level)
+        == sample_size
+    )
+
+
+def test_required_sample_size_reaches_margin_of_error(analyze_failure_rate):
+    sample_size = required_sample_size(0.8, 0.05)
+    analysis = analyze_failure_rate(int(0.2 * sample_size), sample_size)
+    assert analysis.margin_of_error <= 0.05
+
+
+@pytest.mark.parametrize("margin_of_error", [0.0, 1.0])
+def test_required_sample_size_needs_margin_of_error_between_0_and_1(margin_of_error):
+    with pytest.raises(ValueError):
+        required_sample_size(0.9, margin_of_error)
+
+
+@pytest.mark.parametrize("expected_success_rate", [-0.1, 0.0, 1.0, 1.5])
+def test_required_sample_size_needs_uncertain_expectation(expected_success_rate):
+    with pytest.raises(ValueError, match="Expected success rate"):
+        required_sample_size(expected_success_rate, 0.05)
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_batch_analysis_matches_scalar_analysis(use_numpy):
+    pairs = [(failures, total) for total in range(1, 61) for failures in range(total + 1)]
+    pairs += [(1, 47), (6, 100), (3, 1000), (999, 1000), (5, 12345)]
+    measures, sample_sizes = zip(*pairs, strict=True)
+
+    batch = analyse_measures_from_test_samples(measures, sample_sizes, use_numpy=use_numpy)
+
+    scalar = [analyse_measure_from_test_sample(f, t) for f, t in pairs]
+    assert batch == scalar
+    assert export_results_to_csv(batch) == export_results_to_csv(scalar)
+
+
+def test_analysis_columns_are_keyed_by_csv_headers():
+    columns = analysis_columns([0, 6, 100], [100, 100, 100])
+
+    assert list(columns) == StatisticalAnalysis.get_csv_headers()
+    assert list(columns["confidence_lower"]) == [0, 3, 100]
+    assert list(columns["proportion"]) == [0.0, 0.06, 1.0]
+
+
+@pytest.mark.parametrize(
+    "measures, sample_sizes",
+    [([1, 2], [10]), ([1], [0])],
+)
+def test_batch_analysis_rejects_invalid_samples(measures, sample_sizes):
+    with pytest.raises(ValueError):
+        analysis_columns(measures, sample_sizes)
+
+
+@pytest.mark.parametrize(
+    "confidence_level, expected_z",
+    [(0.80, 1.2816), (0.90, 1.6449), (0.95, 1.9600), (0.99, 2.5758)],
+)
+def test_z_score_per_confidence_level(confidence_level, expected_z):
+    assert z_score(confidence_level) == pytest.approx(expected_z, abs=1e-4)
+
+
+def test_higher_confidence_widens_the_interval():
+    analyses = [analyse_measure_from_test_sample(6, 100, level) for level in (0.80, 0.90, 0.99)]
+
+    widths = [a.confidence_interval_prop[1] - a.confidence_interval_prop[0] for a in analyses]
+    assert widths == sorted(widths)
+    assert [a.confidence_level for a in analyses] == [0.80, 0.90, 0.99]
+    assert analyses[0].as_csv_row()[:2] == [6, 100]
+    assert len(analyses[0].as_csv_row()) == len(StatisticalAnalysis.get_csv_headers())
+
+
+@pytest.mark.parametrize("value, expected", [(None, 0.90), ("0.95", 0.95), ("99", 0.99)])
+def test_confidence_level_from_env(monkeypatch, value, expected):
+    if value is None:
+        monkeypatch.delenv("CAT_AI_CONFIDENCE_LEVEL", raising=False)
+    else:
+        monkeypatch.setenv("CAT_AI_CONFIDENCE_LEVEL", value)
+    assert get_confidence_level() == expected
+    assert analyse_measure_from_test_sample(1, 10).confidence_level == expected
+
+
+@pytest.mark.parametrize("confidence_level", [0, 1, 1.5])
+def test_confidence_level_must_be_between_0_and_1(confidence_level):
+    with pytest.raises(ValueError):
+        analyse_measure_from_test_sample(1, 10, confidence_level)
+
+
+def binomial_cdf(k: int, n: int, p: float) -> float:
+    return sum(math.comb(n, i) * p**i * (1 - p) ** (n - i) for i in range(k + 1))
+
+
+@pytest.mark.parametrize(
+    "method, expected_interval",
+    [
+        ("wilson", (0.1119, 0.4687)),
+        ("clopper-pearson", (0.0866, 0.4910)),
+        ("jeffreys", (0.1024, 0.4642)),
+    ],
+)
+def test_interval_methods_match_reference_values(method, expected_interval):
+    lower, upper = confidence_interval(5, 20, 0.95, method)
+
+    assert (lower, upper) == pytest.approx(expected_interval, abs=1e-4)
+
+
+@pytest.mark.parametrize("failures, total", [(0, 10), (3, 10), (10, 10), (7, 250), (0, 2000)])
+def test_clopper_pearson_bounds_are_exact(failures, total):
+    lower, upper = confidence_interval(failures, total, 0.90, "clopper-pearson")
+
+    if failures < total:
+        assert binomial_cdf(failures, total, upper) == pytest.approx(0.05, rel=1e-9)
+    if failures > 0:
+        assert 1 - binomial_cdf(failures - 1, total, lower) == pytest.approx(0.05, rel=1e-9)
+
+
+@pytest.mark.parametrize("method", ["wilson", "clopper-pearson", "jeffreys"])
+@pytest.mark.parametrize("failures, total", [(0, 100), (100, 100), (1, 5)])
+def test_interval_methods_keep_width_at_the_edges(method, failures, total):
+    analysis = analyse_measure_from_test_sample(failures, total, method=method)
+    lower, upper = analysis.confidence_interval_prop
+
+    assert 0 <= lower <= analysis.proportion <= upper <= 1
+    assert upper - lower > 0.01
+    assert analysis.method == method
+    mirrored = confidence_interval(total - failures, total, 0.90, method)
+    assert mirrored == pytest.approx((1 - upper, 1 - lower), abs=1e-12)
+
+
+@pytest.mark.parametrize("method", ["normal", "wilson", "clopper-pearson", "jeffreys"])
+@pytest.mark.parametrize("confidence_level", [0.5, 0.8, 0.9, 0.95, 0.99])
+def test_interval_counts_contain_the_observed_failures(method, confidence_level):
+    for total in range(1, 120):
+        for failures in (0, 1, total // 2, total - 1, total):
+            analysis = analyse_measure_from_test_sample(failures, total, confidence_level, method)
+            lower, upper = analysis.confidence_interval_count
+
+            assert lower <= failures <= upper, (failures, total)
+        assert confidence_interval(0, total, confidence_level, method)[0] == 0.0
+        assert confidence_interval(total, total, confidence_level, method)[1] == 1.0
+
+
+@pytest.mark.parametrize("method", ["normal", "wilson", "clopper-pearson", "jeffreys"])
+def test_interval_needs_a_positive_sample_size(method):
+    with pytest.raises(ValueError, match="Sample size must be positive"):
+        confidence_interval(0, 0, 0.90, method)
+
+
+def test_interval_method_from_env(monkeypatch):
+    monkeypatch.setenv("CAT_AI_INTERVAL_METHOD", "wilson")
+    assert analyse_measure_from_test_sample(0, 100).method == "wilson"
+    assert analysis_columns([0], [100])["confidence_upper"][0] > 0
+
+    monkeypatch.setenv("CAT_AI_INTERVAL_METHOD", "bayes")
+    with pytest.raises(ValueError, match="Unknown interval method"):
+        analyse_measure_from_test_sample(0, 100)
+
+
+def test_interval_methods_share_the_csv_layout():
+    analyses = [
+        analyse_measure_from_test_sample(6, 100, method=method)
+        for method in ("normal", "wilson", "clopper-pearson", "jeffreys")
+    ]
+    assert {len(a.as_csv_row()) for a in analyses} == {len(StatisticalAnalysis.get_csv_headers())}
+    assert len({a.confidence_interval_prop for a in analyses}) == 4
+
+
+def test_intervals_are_cached():
+    confidence_interval.cache_clear()
+    for _ in range(3):
+        analyse_measure_from_test_sample(17, 300, 0.90, "clopper-pearson")
+
+    assert confidence_interval.cache_info().hits == 2
+
+
+def test_accumulator_analysis_matches_the_batch_analysis():
+    outcomes = [i % 7 != 0 for i in range(100)]
+    accumulator = SampleAccumulator()
+
+    for passed in outcomes:
+        accumulator.add(passed)
+
+    assert (accumulator.failure_count, accumulator.sample_size) == (15, 100)
+    assert accumulator.success_count == 85
+    assert accumulator.analysis() == analyse_measure_from_test_sample(15, 100)
+    assert accumulator.analysis(0.95, "wilson") == analyse_measure_from_test_sample(
+        15, 100, 0.95, "wilson"
+    )
+
+
+def test_accumulators_merge_by_summing_counts():
+    outcomes = [i % 3 != 0 for i in range(90)]
+    shards = [SampleAccumulator.from_outcomes(outcomes[i::4]) for i in range(4)]
+
+    merged = sum(shards, SampleAccumulator())
+
+    assert merged == SampleAccumulator.from_outcomes(outcomes)
+    assert pickle.loads(pickle.dumps(merged)) == merged
+    assert shards[0].merge(shards[1]).sample_size == 46
+
+
+def test_empty_accumulator_has_no_analysis():
+    with pytest.raises(ValueError):
+        SampleAccumulator().analysis()